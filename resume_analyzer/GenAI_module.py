@@ -1,26 +1,46 @@
-import spacy
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.schema import SystemMessage
-from langchain.chains import LLMChain
-from langchain.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
+import asyncio
+import json
+import random
 from collections import Counter
-from spacy.matcher import PhraseMatcher
+from nlp_registry import get_registry
+from resume_document import ResumeDocument
+from resume_sections import section_text
+from skill_taxonomy import SkillTaxonomy, get_skill_matcher
+from llm_gateway import LLM_DISABLED_MESSAGE, get_gateway
+from llm_cache import cache_key, get_response_cache
+from context_compression import INSIGHTS_TOKEN_BUDGET, get_compressor
+from instrumentation import timed
 
 class ResumeAnalyzer:
-    def __init__(self, api_key):
-        self.chat_model = ChatGoogleGenerativeAI(model="gemini-1.5-flash-latest", google_api_key=api_key)  # ✅ Fixed API key issue
-        self.nlp = spacy.load("en_core_web_sm")
-        self.skills_list = [
-            "Python", "Machine Learning", "Data Analysis", "Project Management",
-            "Leadership", "Java", "C++", "SQL", "Communication", "Teamwork",
-            "Problem Solving", "Deep Learning", "Artificial Intelligence",
-            "Cloud Computing", "Cybersecurity", "Software Development",
-            "Agile Methodologies", "DevOps", "Big Data", "Data Science",
-            "Natural Language Processing", "Computer Vision"
-        ]
-        self.chain = self.setup_chat_model()
+    # Bump whenever the insights prompt changes so cached responses are not reused
+    PROMPT_VERSION = "1"
+    PACKED_PROMPT_VERSION = "1-packed"
+    # Resumes shorter than this can share one request in packed mode
+    PACK_MAX_CHARS = 6000
+
+    def __init__(self, api_key, registry=None, taxonomy=None, matcher_cache_dir=None, gateway=None, cache=None, compressor=None):
+        # The gateway's client (and its connections) is shared with every other component.
+        # Without an API key only the local features (extract_skills) are available.
+        self.gateway = gateway or (get_gateway(api_key) if api_key else None)
+        self.chat_model = self.gateway.llm if self.gateway is not None else None
+        self.cache = cache if cache is not None else get_response_cache()
+        # Skill matching on lowercase tokens only needs tokenization
+        self.registry = registry or get_registry()
+        # Prompts carry the cleaned resume, not the raw extraction (trimmed only if
+        # RESUME_INSIGHTS_TOKEN_BUDGET is set, since insights need the whole resume)
+        self.compressor = compressor or get_compressor(self.registry)
+        self.nlp = self.registry.get("tokenizer")
+        self.taxonomy = taxonomy or SkillTaxonomy.default()
+        self.skills_list = self.taxonomy.skills
+        # Compiled once per taxonomy version and shared by every analyzer in the process
+        self.skill_matcher = get_skill_matcher(self.taxonomy, self.nlp, cache_dir=matcher_cache_dir)
+        self.prompt = self.setup_chat_model()
+        self.packed_prompt = self.setup_packed_prompt()
 
     def setup_chat_model(self):
+        from langchain.schema import SystemMessage
+        from langchain.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
+
         prompt = ChatPromptTemplate(
             input_variables=['resume_text'],
             messages=[
@@ -34,21 +54,208 @@ Additionally, assess the depth of proficiency for each skill based on years of e
                 )
             ]
         )
-        return LLMChain(llm=self.chat_model, prompt=prompt, verbose=True)
+        return prompt
 
-    def extract_skills(self, resume_text):
-        matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
-        patterns = [self.nlp.make_doc(skill) for skill in self.skills_list]
-        matcher.add("SKILLS", patterns)
+    def setup_packed_prompt(self):
+        from langchain.schema import SystemMessage
+        from langchain.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
 
-        doc = self.nlp(resume_text)
-        matches = matcher(doc)
-        skill_counts = Counter([doc[start:end].text for _, start, end in matches])
+        # Same instructions as the single-resume prompt, asking for one JSON answer per resume
+        system = self.prompt.messages[0].content + '''
+
+You will receive several resumes, each introduced by a line "### RESUME <id>". Analyze each one independently. Respond with only a JSON array, one object per resume, in the form [{"id": "<id>", "insights": "<career insights for that resume>"}].'''
+        return ChatPromptTemplate(
+            input_variables=['resumes'],
+            messages=[
+                SystemMessage(content=system),
+                HumanMessagePromptTemplate.from_template(
+                    "Analyze each resume and provide career insights:\n\n{resumes}"
+                )
+            ]
+        )
+
+    @timed("skills")
+    def extract_skills(self, resume, sections=None):
+        """Skill proficiency from mention counts; `sections` limits the search to e.g. ["skills", "experience"]."""
+        # Reuse the parsed doc when handed a ResumeDocument
+        if isinstance(resume, ResumeDocument):
+            spans = [resume.doc] if sections is None else resume.section_spans(sections)
+        else:
+            spans = [self.nlp(resume if sections is None else section_text(resume, sections))]
+        skill_counts = Counter()
+        for span in spans:
+            matches = self.skill_matcher.find([token.lower_ for token in span])
+            skill_counts.update(span[start:end].text for _, start, end in matches)
 
         return {skill: min(count * 20, 100) for skill, count in skill_counts.items()}
 
-    def get_resume_insights(self, resume_text):
+    def get_resume_insights(self, resume_text, raise_errors=False):
+        """Career insights for one resume; LLM failures come back as an error message unless raise_errors."""
+        if self.gateway is None:
+            if raise_errors:
+                raise RuntimeError(LLM_DISABLED_MESSAGE)
+            return LLM_DISABLED_MESSAGE
+        resume_text = self.compressor.compress(resume_text, token_budget=INSIGHTS_TOKEN_BUDGET)
+        key = cache_key(self.PROMPT_VERSION, self.gateway.model_name, resume_text)
+        insights = self.cache.get(key)
+        if insights is not None:
+            return insights
+        try:
+            insights = self.gateway.invoke(self.prompt.format_messages(resume_text=resume_text))
+        except Exception as e:
+            if raise_errors:
+                raise
+            return f"Error processing the resume: {str(e)}"
+        self.cache.set(key, insights)
+        return insights
+
+    def stream_resume_insights(self, resume_text):
+        """Yields the insights as they are generated; a cached answer comes back as one chunk."""
+        if self.gateway is None:
+            yield LLM_DISABLED_MESSAGE
+            return
+        resume_text = self.compressor.compress(resume_text, token_budget=INSIGHTS_TOKEN_BUDGET)
+        key = cache_key(self.PROMPT_VERSION, self.gateway.model_name, resume_text)
+        insights = self.cache.get(key)
+        if insights is not None:
+            yield insights
+            return
+        chunks = []
+        try:
+            for chunk in self.gateway.stream(self.prompt.format_messages(resume_text=resume_text)):
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            yield f"Error processing the resume: {str(e)}"
+            return
+        self.cache.set(key, "".join(chunks))
+
+    async def aget_resume_insights(self, resume_text):
+        if self.gateway is None:
+            return LLM_DISABLED_MESSAGE
+        resume_text = self.compressor.compress(resume_text, token_budget=INSIGHTS_TOKEN_BUDGET)
+        key = cache_key(self.PROMPT_VERSION, self.gateway.model_name, resume_text)
+        insights = self.cache.get(key)
+        if insights is not None:
+            return insights
         try:
-            return self.chain.run({'resume_text': resume_text})
+            insights = await self.gateway.ainvoke(self.prompt.format_messages(resume_text=resume_text))
         except Exception as e:
             return f"Error processing the resume: {str(e)}"
+        self.cache.set(key, insights)
+        return insights
+
+    def get_resume_insights_many(self, resumes, max_concurrency=None, retries=3, backoff=1.0, pack_size=1):
+        """Insights for many resumes, requested concurrently.
+
+        Returns one dict per resume, in input order, with its "index", "status"
+        ("ok", "cached" or "error"), "insights", "error" and "attempts".
+        With pack_size > 1, short resumes are sent pack_size at a time in one
+        structured-output request; anything the packed reply misses is retried alone.
+        """
+        return asyncio.run(self.aget_resume_insights_many(
+            resumes, max_concurrency=max_concurrency, retries=retries, backoff=backoff, pack_size=pack_size
+        ))
+
+    async def aget_resume_insights_many(self, resumes, max_concurrency=None, retries=3, backoff=1.0, pack_size=1):
+        resumes = list(resumes)
+        if self.gateway is None:
+            return [self._batch_result(i, "error", error=LLM_DISABLED_MESSAGE, attempts=0) for i in range(len(resumes))]
+        texts = [
+            self.compressor.compress(resume.text if isinstance(resume, ResumeDocument) else resume, token_budget=INSIGHTS_TOKEN_BUDGET)
+            for resume in resumes
+        ]
+        results = [None] * len(texts)
+        # The gateway still enforces the process-wide limits on top of this
+        semaphore = asyncio.Semaphore(max_concurrency or self.gateway.max_concurrency)
+
+        pending = []
+        for i, text in enumerate(texts):
+            insights = self.cache.get(cache_key(self.PROMPT_VERSION, self.gateway.model_name, text))
+            if insights is not None:
+                results[i] = self._batch_result(i, "cached", insights, attempts=0)
+            else:
+                pending.append(i)
+
+        if pack_size > 1:
+            packable = [i for i in pending if len(texts[i]) <= self.PACK_MAX_CHARS]
+            packs = [packable[n:n + pack_size] for n in range(0, len(packable), pack_size)]
+            packed = await asyncio.gather(*(
+                self._insights_for_pack(pack, texts, semaphore, retries, backoff) for pack in packs
+            ))
+            for pack_results in packed:
+                for result in pack_results:
+                    results[result["index"]] = result
+            pending = [i for i in pending if results[i] is None]
+
+        singles = await asyncio.gather(*(
+            self._insights_for_one(i, texts[i], semaphore, retries, backoff) for i in pending
+        ))
+        for result in singles:
+            results[result["index"]] = result
+        return results
+
+    @staticmethod
+    def _batch_result(index, status, insights=None, error=None, attempts=1):
+        return {"index": index, "status": status, "insights": insights, "error": error, "attempts": attempts}
+
+    async def _invoke_with_retries(self, messages, semaphore, retries, backoff):
+        # Exponential backoff with jitter; returns (reply, attempts) or raises the last error
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                async with semaphore:
+                    return await self.gateway.ainvoke(messages), attempt
+            except Exception:
+                if attempt > retries:
+                    raise
+                await asyncio.sleep(backoff * 2 ** (attempt - 1) * (0.5 + random.random()))
+
+    async def _insights_for_one(self, index, text, semaphore, retries, backoff):
+        messages = self.prompt.format_messages(resume_text=text)
+        try:
+            insights, attempts = await self._invoke_with_retries(messages, semaphore, retries, backoff)
+        except Exception as e:
+            return self._batch_result(index, "error", error=str(e), attempts=retries + 1)
+        self.cache.set(cache_key(self.PROMPT_VERSION, self.gateway.model_name, text), insights)
+        return self._batch_result(index, "ok", insights, attempts=attempts)
+
+    async def _insights_for_pack(self, indices, texts, semaphore, retries, backoff):
+        # Packed answers are cached under their own prompt version
+        keys = {i: cache_key(self.PACKED_PROMPT_VERSION, self.gateway.model_name, texts[i]) for i in indices}
+        results = []
+        remaining = []
+        for i in indices:
+            insights = self.cache.get(keys[i])
+            if insights is not None:
+                results.append(self._batch_result(i, "cached", insights, attempts=0))
+            else:
+                remaining.append(i)
+        if not remaining:
+            return results
+
+        body = "\n\n".join(f"### RESUME {i}\n{texts[i]}" for i in remaining)
+        try:
+            reply, attempts = await self._invoke_with_retries(
+                self.packed_prompt.format_messages(resumes=body), semaphore, retries, backoff
+            )
+            answers = self._parse_packed_reply(reply)
+        except Exception:
+            # Leave the whole pack to the single-resume path
+            return results
+        for i in remaining:
+            insights = answers.get(str(i))
+            if insights:
+                self.cache.set(keys[i], insights)
+                results.append(self._batch_result(i, "ok", insights, attempts=attempts))
+        return results
+
+    @staticmethod
+    def _parse_packed_reply(reply):
+        # Models often wrap JSON in a markdown fence
+        start, end = reply.find("["), reply.rfind("]")
+        if start == -1 or end < start:
+            raise ValueError("Packed reply is not a JSON array")
+        items = json.loads(reply[start:end + 1])
+        return {str(item["id"]): item.get("insights") for item in items if isinstance(item, dict) and "id" in item}
@@ -1,17 +1,28 @@
 # job_matcher.py
 # AI Resume vs Job Match
 
-import spacy
-from collections import Counter
+import threading
+from collections import Counter, OrderedDict, deque
 from resume_parser import ResumeParser
-import tempfile
-import os
-from collections import Counter
+from nlp_registry import get_registry
+from resume_document import ResumeDocument
+from resume_sections import section_text
+from resume_features import FeatureCache, ResumeFeatures
+from instrumentation import timed
 
 class JobMatcher:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
-        self.resume_parser = ResumeParser()
+    # Features of raw resume texts, shared by every matcher in the process
+    feature_cache = FeatureCache()
+
+    def __init__(self, registry=None):
+        # Keyword overlap only needs token text, so the tokenizer is enough
+        self.registry = registry or get_registry()
+        self.nlp = self.registry.get("tokenizer")
+        self.resume_parser = ResumeParser(registry=self.registry)
+        # Editing a job description only tokenizes the new text. LRU, shared by request threads.
+        self._job_counts = OrderedDict()
+        self._job_counts_lock = threading.Lock()
+        self.max_job_entries = 64
 
     # def match_resume_to_job(self, resume_file, job_description):
     #     """Matches a resume against a job description based on skill overlap."""
@@ -44,31 +55,107 @@ class JobMatcher:
     #         "match_score": match_percentage,
     #         "matched_keywords": list(set(resume_keywords) & set(job_keywords))
     #     }
-    def match_resume_to_job(self, resume_text, job_description):
-        """Matches resume text against a job description based on skill overlap."""
-
-        # NLP processing
+    @timed("job_match")
+    def match_resume_to_job(self, resume, job_description, sections=None):
+        """Matches resume text or a ResumeDocument against a job description based on skill overlap.
+
+        Pass section names (e.g. ["skills", "experience"]) to score only those sections.
+        """
+
+        return self.match_features(self.features(resume, sections), job_description)
+
+    def features(self, resume, sections=None):
+        """Resume-side features, computed once per ResumeDocument or distinct resume text."""
+        if isinstance(resume, ResumeDocument):
+            return resume.features(sections)
+
+        def compute():
+            resume_doc = self.nlp(resume if sections is None else section_text(resume, sections))
+            resume_keywords = [token.text.lower() for token in resume_doc if token.is_alpha]
+            return ResumeFeatures.from_keywords(resume_keywords, resume)
+
+        return self.feature_cache.get_or_compute(FeatureCache.key(resume, sections), compute)
+
+    def job_counts(self, job_description):
+        """Keyword counts of a job description, tokenized once per distinct text."""
+        with self._job_counts_lock:
+            counts = self._job_counts.get(job_description)
+            if counts is not None:
+                self._job_counts.move_to_end(job_description)
+                return counts
+        # Tokenize outside the lock; two threads racing on a new text just store the same counts
         job_doc = self.nlp(job_description)
-        resume_doc = self.nlp(resume_text)
-
-        job_keywords = [token.text.lower() for token in job_doc if token.is_alpha]
-        resume_keywords = [token.text.lower() for token in resume_doc if token.is_alpha]
-
+        counts = Counter(token.text.lower() for token in job_doc if token.is_alpha)
+        with self._job_counts_lock:
+            self._job_counts[job_description] = counts
+            while len(self._job_counts) > self.max_job_entries:
+                self._job_counts.popitem(last=False)
+        return counts
+
+    def match_features(self, features, job_description):
+        """Scores precomputed resume features; only the job description is tokenized (once)."""
+        return self._score_counts(features.counts, self.job_counts(job_description))
+
+    def match_many(self, resumes, job_description, batch_size=64, n_process=1, sections=None):
+        """Matches many resumes (texts or ResumeDocuments) against one job description.
+
+        Raw texts are streamed through nlp.pipe, so n_process > 1 (or -1 for
+        every core) tokenizes them in parallel. Results are yielded in input
+        order as soon as each batch is done. `sections` restricts scoring as in
+        match_resume_to_job.
+        """
+        job_counts = self.job_counts(job_description)
+
+        # Documents are already tokenized; only raw texts go through the pipeline.
+        # Documents queued ahead of the next raw text are scored as soon as it comes back.
+        documents = deque()
+
+        def texts():
+            for i, resume in enumerate(resumes):
+                if isinstance(resume, ResumeDocument):
+                    documents.append((i, resume))
+                else:
+                    yield (resume if sections is None else section_text(resume, sections)), i
+
+        def score(resume_counts, i):
+            result = self._score_counts(resume_counts, job_counts)
+            result["index"] = i
+            return result
+
+        for resume_doc, i in self.nlp.pipe(texts(), as_tuples=True, batch_size=batch_size, n_process=n_process):
+            while documents and documents[0][0] < i:
+                j, document = documents.popleft()
+                yield score(document.features(sections).counts, j)
+            yield score(Counter(token.text.lower() for token in resume_doc if token.is_alpha), i)
+        while documents:
+            j, document = documents.popleft()
+            yield score(document.features(sections).counts, j)
+
+    def rank(self, resumes, job_description, batch_size=64, n_process=1, sections=None):
+        """Returns match results for all resumes, best match first."""
+        results = self.match_many(resumes, job_description, batch_size=batch_size, n_process=n_process, sections=sections)
+        return sorted(results, key=lambda result: result["match_score"], reverse=True)
+
+    @staticmethod
+    def _score(resume_keywords, job_keywords):
+        return JobMatcher._score_counts(Counter(resume_keywords), Counter(job_keywords))
+
+    @staticmethod
+    def _score_counts(resume_counts, job_counts):
         # Calculate matching score
-        from collections import Counter
-        match_score = sum((Counter(resume_keywords) & Counter(job_keywords)).values())
-        total_keywords = len(set(job_keywords))
+        match_score = sum((resume_counts & job_counts).values())
+        total_keywords = len(job_counts)
         match_percentage = (match_score / total_keywords) * 100 if total_keywords > 0 else 0
 
         return {
             "match_score": match_percentage,
-            "matched_keywords": list(set(resume_keywords) & set(job_keywords))
+            "matched_keywords": list(resume_counts.keys() & job_counts.keys())
         }
 
 
 if __name__ == "__main__":
     matcher = JobMatcher()
-    sample_resume = "sample_resume.pdf"  # Change to actual file path
+    sample_resume = ResumeDocument.from_file("sample_resume.pdf")  # Change to actual file path
     sample_job_desc = "Looking for a Python Developer with experience in Machine Learning and SQL."
     result = matcher.match_resume_to_job(sample_resume, sample_job_desc)
     print(result)
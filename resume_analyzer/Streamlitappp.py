@@ -1,15 +1,8 @@
 import streamlit as st
-import os
-import tempfile
-import matplotlib.pyplot as plt
 from io import BytesIO
-from fpdf import FPDF
-from file_handling import FileHandler
-from resume_parser import ResumeParser
-from Job_matcher import JobMatcher
-from ats_scoring import ATSScoring
-from career_coaching import CareerCoach
-from GenAI_module import ResumeAnalyzer  # Ensure correct import
+from streamlit_resources import (
+    load_llm_components, upload_digest, extract_resume, parse_resume, score_resume, extract_skills, start_warmup
+)
 
 # Apply Custom CSS for Better Styling
 def local_css():
@@ -25,6 +18,8 @@ def local_css():
 
 st.set_page_config(page_title="AI Resume Analyzer", layout="wide")
 local_css()
+# Models load in the background while the page renders
+start_warmup()
 
 # Header
 st.markdown('<p class="title">📄 AI-Powered Resume Analyzer</p>', unsafe_allow_html=True)
@@ -37,34 +32,21 @@ uploaded_file = st.file_uploader("📂 Upload Your Resume", type=['pdf', 'docx']
 api_key = st.text_input("🔑 Enter your GEMINI API Key:", type="password")
 
 if uploaded_file and api_key:
-    temp_dir = tempfile.TemporaryDirectory()
-    temp_file_path = os.path.join(temp_dir.name, uploaded_file.name)
-
-    with open(temp_file_path, "wb") as temp_file:
-        temp_file.write(uploaded_file.read())
-
-    # Process Resume
-    file_handler = FileHandler()
-    resume_text = file_handler.extract_text(temp_file_path)
-    page_count = file_handler.get_file_page_count(temp_file_path)
-    st.success(f"✅ Resume Uploaded Successfully | Total Pages: {page_count}")
-
-    # Initialize Modules
-    resume_parser = ResumeParser()
-    job_matcher = JobMatcher()
-    ats_scoring = ATSScoring()
-    career_coach = CareerCoach(api_key=api_key)
-    resume_analyzer = ResumeAnalyzer(api_key)
-    if uploaded_file is not None:
-        with st.spinner("🔍 Extracting resume details..."):
-            # Save the uploaded file to a temporary location
-            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(uploaded_file.name)[1]) as temp_file:
-                temp_file.write(uploaded_file.read())
-                temp_file_path = temp_file.name
-            
-            # Pass the file path to the parser
-            parsed_resume = resume_parser.parse_resume(temp_file_path)
-            
+    # Models and clients load once per server; extraction, parsing and scoring
+    # are cached by the upload's hash, so reruns only redo what changed
+    career_coach, resume_analyzer = load_llm_components(api_key)
+    digest = upload_digest(uploaded_file)
+    try:
+        extracted = extract_resume(digest, uploaded_file)
+    except ValueError as e:
+        st.error(f"❌ {e}")
+        st.stop()
+    st.success(f"✅ Resume Uploaded Successfully | Total Pages: {extracted['page_count']}")
+
+    # Parse once; the same document feeds matching, scoring and skills
+    resume_document = parse_resume(digest, extracted["text"])
+    resume_text = resume_document.text
+    parsed_resume = resume_document.to_dict()
 
     with st.expander("📊 Parsed Resume Details (Click to Expand)"):
         st.write(parsed_resume)
@@ -73,26 +55,28 @@ if uploaded_file and api_key:
 
     if job_description:
         with st.spinner("🔍 Matching resume with job description..."):
-            job_match_score = job_matcher.match_resume_to_job(uploaded_file, job_description)
-            ats_score = ats_scoring.score_resume(resume_text, job_description)
+            scores = score_resume(digest, job_description, resume_document)
+            job_match_score = scores["job_match"]
+            ats_score = scores["ats"]
 
         st.subheader("📊 Job Match & ATS Score")
         st.write(f"✅ **Job Match Score:** {job_match_score}%")
         st.write(f"✅ **ATS Score:** {ats_score}%")
 
-    with st.spinner("🤖 Analyzing career insights..."):
-        insights = resume_analyzer.get_resume_insights(resume_text)
-
-    with st.expander("📊 Resume Insights (Click to Expand)"):
-        st.write(insights)
+    # Render insights token by token as Gemini produces them
+    with st.expander("📊 Resume Insights (Click to Expand)", expanded=True):
+        insights = st.write_stream(resume_analyzer.stream_resume_insights(resume_text))
 
     st.subheader("📌 Skills Analysis")
-    skills_proficiency = resume_analyzer.extract_skills(resume_text)
+    skills_proficiency = extract_skills(digest, resume_document, resume_analyzer)
 
     if skills_proficiency:
         skills = list(skills_proficiency.keys())
         proficiency = list(skills_proficiency.values())
 
+        # Imported on first chart, not on every page load
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots(figsize=(8, 4))
         ax.barh(skills, proficiency, color='skyblue')
         ax.set_xlabel('Proficiency (%)')
@@ -105,11 +89,11 @@ if uploaded_file and api_key:
     user_query = st.text_input("🔍 Ask the Career Coach:")
     
     if user_query:
-        with st.spinner("🤖 Generating career advice..."):
-            career_advice = career_coach.get_career_advice(user_query)
-        st.write(career_advice)
+        career_advice = st.write_stream(career_coach.stream_career_advice(resume_text, user_query))
 
     def create_pdf(text):
+        from fpdf import FPDF
+
         pdf = FPDF()
         pdf.add_page()
         pdf.set_font("Arial", size=12)
@@ -135,8 +119,6 @@ if uploaded_file and api_key:
 
         if st.button("📊 Download Skill Analysis as PNG"):
             st.download_button(label="Download PNG", data=convert_fig_to_bytes(fig), file_name="skills_analysis.png", mime="image/png")
-
-    temp_dir.cleanup()
 else:
     st.info("📂 Please upload a resume and enter API key to get started.")
 
@@ -1,17 +1,10 @@
 import streamlit as st
-import os
-import tempfile
-import matplotlib.pyplot as plt
 from io import BytesIO
-from fpdf import FPDF
 
 # Local modules
-from file_handling import FileHandler
-from resume_parser import ResumeParser
-from Job_matcher import JobMatcher
-from ats_scoring import ATSScoring
-from career_coaching import CareerCoach
-from GenAI_module import ResumeAnalyzer
+from streamlit_resources import (
+    load_llm_components, upload_digest, extract_resume, parse_resume, score_resume, extract_skills, start_warmup
+)
 
 # 🌐 Apply Custom CSS
 def local_css():
@@ -28,6 +21,8 @@ def local_css():
 # 🌟 Streamlit Page Setup
 st.set_page_config(page_title="AI Resume Analyzer", layout="wide")
 local_css()
+# Models load in the background while the page renders
+start_warmup()
 
 # 🧾 Header
 st.markdown('<p class="title">📄 AI-Powered Resume Analyzer</p>', unsafe_allow_html=True)
@@ -42,26 +37,21 @@ api_key = st.text_input("🔑 Enter your GEMINI API Key:", type="password")
 
 # 👉 Proceed only if file and API key are provided
 if uploaded_file and api_key:
-    # Save uploaded file to temporary location
-    temp_dir = tempfile.TemporaryDirectory()
-    file_path = os.path.join(temp_dir.name, uploaded_file.name)
-    with open(file_path, "wb") as f:
-        f.write(uploaded_file.read())
-
-    # Initialize Modules
-    file_handler = FileHandler()
-    resume_text = file_handler.extract_text(file_path)
-    page_count = file_handler.get_file_page_count(file_path)
-    st.success(f"✅ Resume Uploaded Successfully | Total Pages: {page_count}")
-
-    resume_parser = ResumeParser()
-    job_matcher = JobMatcher()
-    ats_scoring = ATSScoring()
-    career_coach = CareerCoach(api_key=api_key)
-    resume_analyzer = ResumeAnalyzer(api_key)
-
-    with st.spinner("🔍 Extracting resume details..."):
-        parsed_resume = resume_parser.parse_resume(file_path)
+    # Models and clients load once per server; extraction, parsing and scoring
+    # are cached by the upload's hash, so reruns only redo what changed
+    career_coach, resume_analyzer = load_llm_components(api_key)
+    digest = upload_digest(uploaded_file)
+    try:
+        extracted = extract_resume(digest, uploaded_file)
+    except ValueError as e:
+        st.error(f"❌ {e}")
+        st.stop()
+    st.success(f"✅ Resume Uploaded Successfully | Total Pages: {extracted['page_count']}")
+
+    # Parse once; the same document feeds matching, scoring and skills
+    resume_document = parse_resume(digest, extracted["text"])
+    resume_text = resume_document.text
+    parsed_resume = resume_document.to_dict()
     with st.expander("📊 Parsed Resume Details (Click to Expand)"):
         st.write(parsed_resume)
 
@@ -69,25 +59,28 @@ if uploaded_file and api_key:
     job_description = st.text_area("📝 Paste Job Description for Matching:")
     if job_description:
         with st.spinner("🔍 Matching resume with job description..."):
-            job_match_score = job_matcher.match_resume_to_job(file_path, job_description)
-            ats_score = ats_scoring.score_resume(resume_text, job_description)
+            scores = score_resume(digest, job_description, resume_document)
+            job_match_score = scores["job_match"]
+            ats_score = scores["ats"]
 
         st.subheader("📊 Job Match & ATS Score")
         st.write(f"✅ **Job Match Score:** {job_match_score}%")
         st.write(f"✅ **ATS Score:** {ats_score}%")
 
     # 🧠 Resume Insights
-    with st.spinner("🤖 Analyzing career insights..."):
-        insights = resume_analyzer.get_resume_insights(resume_text)
-    with st.expander("📊 Resume Insights (Click to Expand)"):
-        st.write(insights)
+    # Render insights token by token as Gemini produces them
+    with st.expander("📊 Resume Insights (Click to Expand)", expanded=True):
+        insights = st.write_stream(resume_analyzer.stream_resume_insights(resume_text))
 
     # 🧪 Skill Proficiency
     st.subheader("📌 Skills Analysis")
-    skills_proficiency = resume_analyzer.extract_skills(resume_text)
+    skills_proficiency = extract_skills(digest, resume_document, resume_analyzer)
     if skills_proficiency:
         skills = list(skills_proficiency.keys())
         proficiency = list(skills_proficiency.values())
+        # Imported on first chart, not on every page load
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots(figsize=(8, 4))
         ax.barh(skills, proficiency, color='skyblue')
         ax.set_xlabel('Proficiency (%)')
@@ -100,9 +93,7 @@ if uploaded_file and api_key:
     st.subheader("💼 Career Advice")
     user_query = st.text_input("🔍 Ask the Career Coach:")
     if user_query:
-        with st.spinner("🤖 Generating career advice..."):
-            advice = career_coach.get_career_advice(resume_text, user_query)  # ✅ Corrected
-        st.write(advice)
+        advice = st.write_stream(career_coach.stream_career_advice(resume_text, user_query))
 
     # 📥 Downloads
     st.markdown("---")
@@ -110,6 +101,8 @@ if uploaded_file and api_key:
     col1, col2 = st.columns(2)
 
     def create_pdf(text):
+        from fpdf import FPDF
+
         pdf = FPDF()
         pdf.add_page()
         pdf.set_font("Arial", size=12)
@@ -131,8 +124,6 @@ if uploaded_file and api_key:
 
         if st.button("📊 Download Skill Analysis as PNG"):
             st.download_button("Download PNG", data=convert_fig_to_bytes(fig), file_name="skills_analysis.png", mime="image/png")
-
-    temp_dir.cleanup()
 else:
     st.info("📂 Please upload a resume and enter API key to get started.")
 
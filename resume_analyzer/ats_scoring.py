@@ -1,24 +1,25 @@
 # ats_scoring.py
 # AI Resume Scoring & Improvements
 
-import spacy
 from Job_matcher import JobMatcher
+from nlp_registry import get_registry
+from resume_document import ResumeDocument
+from instrumentation import timed
 
 class ATSScoring:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
-        self.job_matcher = JobMatcher()
+    def __init__(self, registry=None):
+        self.registry = registry or get_registry()
+        self.job_matcher = JobMatcher(registry=self.registry)
 
-    def score_resume(self, resume_text, job_description):
-        """Scores the resume based on keyword match and readability."""
+    @timed("ats_score")
+    def score_resume(self, resume, job_description):
+        """Scores the resume (text or ResumeDocument) based on keyword match and readability."""
 
-        match_result = self.job_matcher.match_resume_to_job(resume_text, job_description)
-        match_score = match_result["match_score"]
-
-        # Readability Score (basic approximation based on sentence length)
-        sentences = resume_text.split(".")
-        avg_sentence_length = sum(len(sent.split()) for sent in sentences) / max(len(sentences), 1)
-        readability_score = max(100 - avg_sentence_length, 0)
+        # Resume keywords and readability are computed once per resume and reused
+        # for every job description it is scored against
+        features = self.job_matcher.features(resume)
+        match_score = self.job_matcher.match_features(features, job_description)["match_score"]
+        readability_score = features.readability_score
 
         return {
             "match_score": match_score,
@@ -28,7 +29,7 @@ class ATSScoring:
 
 if __name__ == "__main__":
     ats = ATSScoring()
-    sample_resume = "sample_resume.pdf"  # Change to actual file path
+    sample_resume = ResumeDocument.from_file("sample_resume.pdf")  # Change to actual file path
     sample_job_desc = "Looking for a Python Developer with experience in Machine Learning and SQL."
     result = ats.score_resume(sample_resume, sample_job_desc)
     print(result)
@@ -0,0 +1,280 @@
+# benchmark.py
+# Per-stage latency, throughput, memory and startup time of the analysis pipeline
+#
+#   python benchmark.py --count 60 --pages 1 2 5 -o bench.json
+#
+# Resumes come from synthetic_corpus (or --corpus DIR) and the LLM is a local
+# stub with a fixed latency, so runs are reproducible and need no API key.
+# Compare the JSON from two releases to spot regressions.
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_JOB_DESCRIPTION = ("Looking for a Python Developer with experience in Machine Learning, SQL, "
+                           "Data Analysis and Leadership to build data pipelines and REST services.")
+DEFAULT_QUERY = "What should I improve in my resume?"
+
+# Imported in this order in a fresh interpreter to measure startup
+STARTUP_MODULES = ["file_handling", "nlp_registry", "resume_document", "Job_matcher", "ats_scoring",
+                   "llm_gateway", "GenAI_module", "career_coaching"]
+
+_STARTUP_SCRIPT = """
+import json, sys, time
+timings = {}
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    t = time.perf_counter()
+    __import__(name)
+    timings["import:" + name] = time.perf_counter() - t
+timings["imports_total"] = time.perf_counter() - start
+from nlp_registry import get_registry
+for profile in ("tokenizer", "ner"):
+    t = time.perf_counter()
+    get_registry().get(profile)
+    timings["model_load:" + profile] = time.perf_counter() - t
+timings["startup_total"] = time.perf_counter() - start
+print(json.dumps(timings))
+"""
+
+
+# Dependencies that should only be imported when first used, never by importing an entry point
+HEAVY_MODULES = ("spacy", "langchain", "langchain_core", "langchain_google_genai", "google.ai.generativelanguage",
+                 "pdfplumber", "pypdfium2", "docx", "matplotlib", "fpdf", "numpy", "scipy")
+# Entry points whose import cost is profiled
+PROFILED_ENTRY_POINTS = ("app", "streamlit_resources")
+
+
+def profile_imports(module, top=10):
+    """Import cost of one module in a fresh interpreter, from python -X importtime.
+
+    Returns the wall time, its slowest direct imports (cumulative seconds) and
+    which heavy dependencies it pulled in eagerly.
+    """
+    script = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script], cwd=HERE, capture_output=True, text=True, check=True
+    )
+
+    # Lines look like "import time:  self [us] | cumulative | <indent>package"; the
+    # indent grows by two spaces per nesting level and children come before their parent
+    children, direct, loaded = [], [], set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        loaded.add(name)
+        if depth == 1:
+            children.append((name, int(cumulative) / 1e6))
+        elif depth == 0:
+            if name == module:
+                direct = children
+            children = []
+
+    return {
+        "import_s": float(completed.stdout.strip().splitlines()[-1]),
+        "slowest_direct_imports_s": dict(sorted(direct, key=lambda item: item[1], reverse=True)[:top]),
+        "eager_heavy_modules": [name for name in HEAVY_MODULES if name in loaded]
+    }
+
+
+def measure_startup():
+    """Import and model-load times (seconds) in a fresh interpreter, so nothing is already cached."""
+    t = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", _STARTUP_SCRIPT] + STARTUP_MODULES,
+        cwd=HERE, capture_output=True, text=True, check=True
+    ).stdout
+    timings = json.loads(output.strip().splitlines()[-1])
+    timings["process_total"] = time.perf_counter() - t
+    return timings
+
+
+class StageTimer:
+    def __init__(self):
+        self.durations = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations.setdefault(name, []).append(time.perf_counter() - start)
+
+    def summary(self):
+        return {name: summarize(values) for name, values in self.durations.items()}
+
+
+def summarize(durations):
+    values = np.asarray(durations) * 1000
+    total = float(values.sum()) / 1000
+    return {
+        "count": len(values),
+        "total_s": total,
+        "mean_ms": float(values.mean()),
+        "p50_ms": float(np.percentile(values, 50)),
+        "p90_ms": float(np.percentile(values, 90)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "max_ms": float(values.max()),
+        "throughput_per_s": len(values) / total if total else None
+    }
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale
+    return {"self": own, "children": children}
+
+
+def stub_gateway(latency):
+    """An LLMGateway over a local fake chat model that answers after `latency` seconds."""
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+    from llm_gateway import LLMGateway
+
+    class StubChatModel(FakeListChatModel):
+        latency: float = 0.0
+
+        def _generate(self, *args, **kwargs):
+            time.sleep(self.latency)
+            return super()._generate(*args, **kwargs)
+
+    llm = StubChatModel(responses=["Stub analysis of the resume."], latency=latency)
+    return LLMGateway(llm, max_concurrency=64, requests_per_minute=10 ** 9, native_async=False)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=HERE, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(paths, job_description=DEFAULT_JOB_DESCRIPTION, query=DEFAULT_QUERY, llm_latency=0.2):
+    """Runs every stage once per resume and returns the per-stage summary."""
+    from extraction_cache import ExtractionCache
+    from file_handling import FileHandler
+    from nlp_registry import get_registry
+    from resume_document import ResumeDocument
+    from Job_matcher import JobMatcher
+    from ats_scoring import ATSScoring
+    from GenAI_module import ResumeAnalyzer
+    from career_coaching import CareerCoach
+    from context_compression import ResumeCompressor
+    from llm_cache import MemoryCache
+
+    timer = StageTimer()
+    # A private, empty cache: the first extraction of each file is a miss, the second a hit
+    FileHandler.cache = ExtractionCache()
+
+    registry = get_registry()
+    with timer.stage("model_load"):
+        registry.get("ner")
+        registry.get("tokenizer")
+    gateway = stub_gateway(llm_latency)
+    with timer.stage("construct"):
+        job_matcher = JobMatcher(registry=registry)
+        ats = ATSScoring(registry=registry)
+        compressor = ResumeCompressor(registry=registry)
+        analyzer = ResumeAnalyzer("stub", registry=registry, gateway=gateway, cache=MemoryCache(), compressor=compressor)
+        coach = CareerCoach("stub", gateway=gateway, cache=MemoryCache(), compressor=compressor)
+
+    documents = []
+    for path in paths:
+        with timer.stage("end_to_end"):
+            with timer.stage("extract"):
+                text = FileHandler.extract(path)["text"]
+            with timer.stage("parse"):
+                document = ResumeDocument.from_text(text, registry=registry, source=path)
+            with timer.stage("job_match"):
+                job_matcher.match_resume_to_job(document, job_description)
+            with timer.stage("ats_score"):
+                ats.score_resume(document, job_description)
+            with timer.stage("skills"):
+                analyzer.extract_skills(document)
+            with timer.stage("compress"):
+                compressor.compress(text, query)
+            with timer.stage("llm_insights"):
+                analyzer.get_resume_insights(text)
+            with timer.stage("llm_advice"):
+                coach.get_career_advice(text, query)
+        # Repeat work that should now be served from caches
+        with timer.stage("extract_cached"):
+            FileHandler.extract(path)
+        with timer.stage("ats_score_jd_edit"):
+            ats.score_resume(document, job_description + " Kubernetes")
+        with timer.stage("llm_insights_cached"):
+            analyzer.get_resume_insights(text)
+        documents.append(document)
+
+    # Whole-corpus stages
+    with timer.stage("batch_rank"):
+        job_matcher.rank(documents, job_description)
+    with timer.stage("batch_llm_insights"):
+        analyzer.cache.clear()
+        analyzer.get_resume_insights_many([document.text for document in documents])
+
+    return timer.summary()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark extraction, NLP, scoring and (stubbed) LLM stages.")
+    parser.add_argument("--corpus", help="Directory of PDF/DOCX resumes (default: generate a synthetic corpus)")
+    parser.add_argument("--count", type=int, default=30, help="Synthetic resumes to generate")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 2, 5], help="Synthetic page counts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds the stub LLM takes per call")
+    parser.add_argument("--skip-startup", action="store_true", help="Do not measure fresh-interpreter startup")
+    parser.add_argument("-o", "--output", default="benchmark.json")
+    args = parser.parse_args(argv)
+
+    results = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "args": vars(args),
+    }
+    if not args.skip_startup:
+        results["startup_s"] = measure_startup()
+        results["entry_point_imports"] = {module: profile_imports(module) for module in PROFILED_ENTRY_POINTS}
+
+    with tempfile.TemporaryDirectory(prefix="resume-bench-") as workdir:
+        if args.corpus:
+            paths = sorted(
+                os.path.join(args.corpus, name) for name in os.listdir(args.corpus)
+                if name.lower().endswith((".pdf", ".docx"))
+            )
+        else:
+            from synthetic_corpus import generate_corpus
+            paths = generate_corpus(workdir, args.count, tuple(args.pages), seed=args.seed)
+        results["corpus"] = {"resumes": len(paths), "bytes": sum(os.path.getsize(path) for path in paths)}
+        results["stages"] = run_benchmark(paths, llm_latency=args.llm_latency)
+
+    results["peak_rss_mb"] = peak_rss_mb()
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    for name, stats in results["stages"].items():
+        print(f"{name:22s} n={stats['count']:4d}  p50={stats['p50_ms']:9.2f} ms  p90={stats['p90_ms']:9.2f} ms  "
+              f"p99={stats['p99_ms']:9.2f} ms")
+    print(f"Peak RSS: {results['peak_rss_mb']['self']:.0f} MB. Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+# bulk_screen.py
+# Screen a folder or zip of resumes against one or more job descriptions
+#
+#   python bulk_screen.py resumes/ -j backend.txt -j data.txt -o ranked.csv
+#
+# Finished resumes are appended to a checkpoint file, so an interrupted run
+# picks up where it stopped when started again with the same arguments.
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from multiprocessing import Pool
+
+RESUME_EXTENSIONS = (".pdf", ".docx")
+COLUMNS = ["job", "rank", "resume_id", "overall_score", "match_score", "readability_score", "page_count", "error"]
+
+# Per-process scorer, built once by the pool initializer
+_ats = None
+_nlp = None
+
+
+def _init_worker():
+    global _ats, _nlp
+    from nlp_registry import get_registry
+    from ats_scoring import ATSScoring
+    from file_handling import disable_parallel_pages
+
+    # Every core already runs one of these workers
+    disable_parallel_pages()
+
+    registry = get_registry()
+    _ats = ATSScoring(registry=registry)
+    # Scoring only needs token text, so resumes are tokenized, not fully parsed
+    _nlp = registry.get("tokenizer")
+
+
+def screen_resume(item):
+    """Scores one resume against every job description; runs in a worker process."""
+    from file_handling import FileHandler
+    from resume_document import ResumeDocument
+
+    resume_id, path, archive, jobs = item
+    rows = []
+    temp_path = None
+    try:
+        if archive is not None:
+            # Zip members are copied to a temp file under a generated name, never their archive path
+            fd, temp_path = tempfile.mkstemp(prefix="resume-", suffix=os.path.splitext(path)[1].lower())
+            with zipfile.ZipFile(archive) as zf, zf.open(path) as src, os.fdopen(fd, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            path = temp_path
+
+        extracted = FileHandler.extract(path)
+        if extracted["page_count"] is None:
+            raise ValueError(extracted["text"])
+        document = ResumeDocument(extracted["text"], _nlp(extracted["text"]), source=resume_id)
+        for job, job_description in jobs:
+            scores = _ats.score_resume(document, job_description)
+            rows.append({"job": job, "resume_id": resume_id, "page_count": extracted["page_count"], "error": "", **scores})
+    except Exception as e:
+        rows = [{"job": job, "resume_id": resume_id, "error": str(e)} for job, _ in jobs]
+    finally:
+        if temp_path is not None:
+            os.remove(temp_path)
+    return resume_id, rows
+
+
+def find_resumes(source):
+    """Lists (resume_id, path, archive) for every PDF/DOCX under a folder or inside a zip, sorted by ID.
+
+    For a zip, path is the member name and archive the zip file.
+    """
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as zf:
+            return sorted(
+                (member.filename, member.filename, source) for member in zf.infolist()
+                if not member.is_dir() and member.filename.lower().endswith(RESUME_EXTENSIONS)
+            )
+
+    resumes = []
+    for root, _, files in os.walk(source):
+        for name in files:
+            if name.lower().endswith(RESUME_EXTENSIONS):
+                path = os.path.join(root, name)
+                resumes.append((os.path.relpath(path, source), path, None))
+    return sorted(resumes)
+
+
+def load_jobs(paths):
+    """Reads each job description file; the job is named after the file."""
+    jobs = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            jobs.append((os.path.splitext(os.path.basename(path))[0], f.read()))
+    names = [name for name, _ in jobs]
+    if len(set(names)) != len(names):
+        raise ValueError("Job description files must have distinct names.")
+    return jobs
+
+
+def jobs_fingerprint(jobs):
+    return hashlib.sha256(json.dumps(jobs).encode("utf-8")).hexdigest()
+
+
+class Checkpoint:
+    """Append-only JSON lines log of finished resumes."""
+
+    def __init__(self, path, fingerprint, fresh=False):
+        self.path = path
+        self.done = {}
+        if os.path.exists(path) and not fresh:
+            with open(path, "rb") as f:
+                header = json.loads(f.readline() or b"{}")
+                if header.get("jobs") != fingerprint:
+                    raise ValueError(f"{path} was written for other job descriptions; rerun with --fresh to start over.")
+                end = f.tell()
+                for line in f:
+                    # A line cut short by the interruption, even one that happens to be valid JSON
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    self.done[record["resume_id"]] = record["rows"]
+                    end = f.tell()
+            self._file = open(path, "r+", encoding="utf-8")
+            # Drop any partial last line before appending
+            self._file.truncate(end)
+            self._file.seek(end)
+        else:
+            self._file = open(path, "w", encoding="utf-8")
+            self._file.write(json.dumps({"jobs": fingerprint}) + "\n")
+
+    def add(self, resume_id, rows):
+        self.done[resume_id] = rows
+        self._file.write(json.dumps({"resume_id": resume_id, "rows": rows}) + "\n")
+
+    def flush(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+def rank_rows(results):
+    """Flattens per-resume rows and ranks them per job by overall score; failed resumes go last."""
+    rows = [row for resume_rows in results for row in resume_rows]
+    rows.sort(key=lambda row: (row["job"], -row.get("overall_score", -1), row["resume_id"]))
+    current, rank = None, 0
+    for row in rows:
+        rank = rank + 1 if row["job"] == current else 1
+        current = row["job"]
+        row["rank"] = rank if not row.get("error") else None
+    return rows
+
+
+def write_results(rows, output):
+    if output.endswith(".parquet"):
+        try:
+            import pandas as pd
+        except ImportError:
+            raise SystemExit("Writing Parquet needs pandas and pyarrow: pip install pandas pyarrow")
+        pd.DataFrame(rows, columns=COLUMNS).to_parquet(output, index=False)
+        return
+
+    with open(output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+class Progress:
+    def __init__(self, total, done=0, stream=sys.stderr, every=1.0):
+        self.total = total
+        self.done = done
+        self.started_with = done
+        self.failed = 0
+        self.stream = stream
+        self.every = every
+        self.start = self._last = time.monotonic()
+
+    def update(self, failed=False):
+        self.done += 1
+        self.failed += failed
+        now = time.monotonic()
+        if now - self._last >= self.every or self.done == self.total:
+            self._last = now
+            rate = (self.done - self.started_with) / max(now - self.start, 1e-9)
+            eta = (self.total - self.done) / rate if rate else 0
+            self.stream.write(f"\r{self.done}/{self.total} resumes, {self.failed} failed, {rate:.1f}/s, ETA {eta:.0f}s ")
+            self.stream.flush()
+
+
+def run(source, job_paths, output, checkpoint_path=None, workers=None, chunksize=8, fresh=False, checkpoint_every=100):
+    jobs = load_jobs(job_paths)
+    checkpoint = Checkpoint(checkpoint_path or output + ".checkpoint.jsonl", jobs_fingerprint(jobs), fresh=fresh)
+
+    resumes = find_resumes(source)
+    todo = [(resume_id, path, archive, jobs) for resume_id, path, archive in resumes if resume_id not in checkpoint.done]
+    progress = Progress(len(resumes), done=len(resumes) - len(todo))
+    if checkpoint.done:
+        sys.stderr.write(f"Resuming: {progress.done} of {len(resumes)} resumes already screened\n")
+
+    try:
+        with Pool(workers or os.cpu_count(), initializer=_init_worker) as pool:
+            for n, (resume_id, rows) in enumerate(pool.imap_unordered(screen_resume, todo, chunksize=chunksize), 1):
+                checkpoint.add(resume_id, rows)
+                if n % checkpoint_every == 0:
+                    checkpoint.flush()
+                progress.update(failed=bool(rows and rows[0]["error"]))
+    finally:
+        checkpoint.close()
+        sys.stderr.write("\n")
+
+    rows = rank_rows(checkpoint.done[resume_id] for resume_id, _, _ in resumes if resume_id in checkpoint.done)
+    write_results(rows, output)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank a folder or zip of PDF/DOCX resumes against job descriptions.")
+    parser.add_argument("resumes", help="Folder or .zip of PDF/DOCX resumes")
+    parser.add_argument("-j", "--job", dest="jobs", action="append", required=True,
+                        help="Job description text file (repeat for several jobs)")
+    parser.add_argument("-o", "--output", default="screening_results.csv", help="Output .csv or .parquet file")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint.jsonl)")
+    parser.add_argument("-w", "--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=8, help="Resumes handed to a worker at a time")
+    parser.add_argument("--fresh", action="store_true", help="Ignore an existing checkpoint and start over")
+    args = parser.parse_args(argv)
+
+    rows = run(args.resumes, args.jobs, args.output, checkpoint_path=args.checkpoint, workers=args.workers,
+               chunksize=args.chunksize, fresh=args.fresh)
+    print(f"Wrote {len(rows)} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
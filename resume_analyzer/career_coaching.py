@@ -1,18 +1,28 @@
 # career_coach.py
 # AI Career Coach Chatbot
 
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.schema import SystemMessage
-from langchain.chains import LLMChain
-from langchain.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
+from llm_gateway import get_gateway
+from llm_cache import cache_key, get_response_cache
+from context_compression import get_compressor
 
 
 class CareerCoach:
-    def __init__(self, api_key):
-        self.chat_model = ChatGoogleGenerativeAI(model="gemini-1.5-flash-latest", google_api_key=api_key)
-        self.chain = self.setup_chat_model()
+    # Bump whenever the coaching prompt changes so cached responses are not reused
+    PROMPT_VERSION = "1"
+
+    def __init__(self, api_key, gateway=None, cache=None, compressor=None):
+        # The gateway's client (and its connections) is shared with every other component
+        self.gateway = gateway or get_gateway(api_key)
+        self.chat_model = self.gateway.llm
+        self.cache = cache if cache is not None else get_response_cache()
+        # Only the resume sections relevant to each question are sent, within a token budget
+        self.compressor = compressor or get_compressor()
+        self.prompt = self.setup_chat_model()
 
     def setup_chat_model(self):
+        from langchain.schema import SystemMessage
+        from langchain.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
+
         prompt = ChatPromptTemplate.from_messages([
             SystemMessage(content="""
                 You are an AI-powered career coach with expertise in job search strategies, 
@@ -31,17 +41,59 @@ class CareerCoach:
                 {user_query}
             """)
         ])
-        return LLMChain(llm=self.chat_model, prompt=prompt, verbose=True)
+        return prompt
+
+    def get_career_advice(self, resume_text, user_query, raise_errors=False):
+        """Advice for one question; LLM failures come back as an error message unless raise_errors."""
+        resume_text = self.compressor.compress(resume_text, user_query)
+        key = cache_key(self.PROMPT_VERSION, self.gateway.model_name, resume_text, user_query)
+        advice = self.cache.get(key)
+        if advice is not None:
+            return advice
+        try:
+            advice = self.gateway.invoke(self.prompt.format_messages(resume=resume_text, user_query=user_query))
+        except Exception as e:
+            if raise_errors:
+                raise
+            return f"Error generating advice: {str(e)}"
+        self.cache.set(key, advice)
+        return advice
+
+    def stream_career_advice(self, resume_text, user_query):
+        """Yields the advice as it is generated; a cached answer comes back as one chunk."""
+        resume_text = self.compressor.compress(resume_text, user_query)
+        key = cache_key(self.PROMPT_VERSION, self.gateway.model_name, resume_text, user_query)
+        advice = self.cache.get(key)
+        if advice is not None:
+            yield advice
+            return
+        chunks = []
+        try:
+            for chunk in self.gateway.stream(self.prompt.format_messages(resume=resume_text, user_query=user_query)):
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            yield f"Error generating advice: {str(e)}"
+            return
+        self.cache.set(key, "".join(chunks))
 
-    def get_career_advice(self, resume_text, user_query):
+    async def aget_career_advice(self, resume_text, user_query):
+        resume_text = self.compressor.compress(resume_text, user_query)
+        key = cache_key(self.PROMPT_VERSION, self.gateway.model_name, resume_text, user_query)
+        advice = self.cache.get(key)
+        if advice is not None:
+            return advice
         try:
-            return self.chain.run({'resume': resume_text, 'user_query': user_query})
+            advice = await self.gateway.ainvoke(self.prompt.format_messages(resume=resume_text, user_query=user_query))
         except Exception as e:
             return f"Error generating advice: {str(e)}"
+        self.cache.set(key, advice)
+        return advice
 
 if __name__ == "__main__":
     api_key = "your_google_api_key_here"  # Replace with actual API key
     coach = CareerCoach(api_key)
+    resume_text = "Software engineer with five years of Python, SQL and REST API experience."
     query = "How can I transition from a software engineer to a data scientist?"
-    response = coach.get_career_advice(query)
+    response = coach.get_career_advice(resume_text, query)
     print(response)
@@ -0,0 +1,169 @@
+# context_compression.py
+# Shrinks extracted resume text before it is sent to the LLM
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from nlp_registry import get_registry
+from llm_cache import normalize_text
+from resume_sections import HEADER, segment
+from instrumentation import timed
+
+# Rough provider token estimate: about four characters per token for English text
+CHARS_PER_TOKEN = 4
+DEFAULT_TOKEN_BUDGET = int(os.environ.get("RESUME_TOKEN_BUDGET", 1500))
+# Insights assess the whole resume, so by default it is only cleaned, never trimmed (0 = no limit)
+INSIGHTS_TOKEN_BUDGET = int(os.environ.get("RESUME_INSIGHTS_TOKEN_BUDGET", 0))
+
+# Lines that carry no information for the model
+BOILERPLATE = [
+    re.compile(r"^page \d+( of \d+)?$", re.I),
+    # Bare page numbers ("3", "- 3 -"); longer digit runs may be phone numbers or IDs
+    re.compile(r"^(-\s*)?\d{1,3}(\s*-)?$"),
+    re.compile(r"^(curriculum vitae|resume|cv)$", re.I),
+    re.compile(r"^references (are )?available (up)?on request\.?$", re.I),
+    re.compile(r"^[\W_]+$"),
+]
+TABLE_PIPES = re.compile(r"\s*\|+\s*")
+
+
+def estimate_tokens(text):
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def clean_lines(text, seen=None):
+    """Removes table pipes, boilerplate and repeated lines (e.g. page headers) from extracted text.
+
+    Pass the same `seen` set across calls to drop lines already kept elsewhere in the resume.
+    """
+    lines = []
+    seen = set() if seen is None else seen
+    for line in text.splitlines():
+        line = " ".join(TABLE_PIPES.sub(" | ", line).strip(" |").split())
+        if not line or any(pattern.match(line) for pattern in BOILERPLATE):
+            continue
+        key = line.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+    return lines
+
+
+class ContextSection:
+    def __init__(self, name, lines, terms):
+        self.name = name
+        self.lines = lines
+        self.terms = terms
+        self.tokens = estimate_tokens("\n".join(lines))
+
+
+class ResumeCompressor:
+    """Fits a resume into a token budget, keeping the sections most relevant to a query.
+
+    The cleaned, sectioned form of each resume is cached by content hash, so
+    follow-up questions about the same resume only re-rank its sections.
+    """
+
+    def __init__(self, registry=None, token_budget=DEFAULT_TOKEN_BUDGET, max_entries=128):
+        self.registry = registry or get_registry()
+        self.token_budget = token_budget
+        self.max_entries = max_entries
+        self._prepared = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def nlp(self):
+        # Relevance is plain term overlap, so the tokenizer is enough
+        return self.registry.get("tokenizer")
+
+    def terms(self, text):
+        return {token.lower_ for token in self.nlp(text) if token.is_alpha and not token.is_stop}
+
+    def prepare(self, text):
+        """Returns the cleaned sections of a resume, computed once per distinct text."""
+        key = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        with self._lock:
+            sections = self._prepared.get(key)
+            if sections is not None:
+                self._prepared.move_to_end(key)
+                return sections
+
+        # Sections come from the shared segmenter; repeated lines are dropped across the whole resume
+        seen = set()
+        sections = []
+        for section in segment(text):
+            lines = clean_lines(section.text, seen)
+            if lines:
+                sections.append(ContextSection(section.name, lines, self.terms("\n".join(lines))))
+
+        with self._lock:
+            self._prepared[key] = sections
+            while len(self._prepared) > self.max_entries:
+                self._prepared.popitem(last=False)
+        return sections
+
+    @timed("compress")
+    def compress(self, text, query="", token_budget=None):
+        """Returns the resume text trimmed to the budget, most query-relevant sections first in line.
+
+        A budget of 0 keeps every section and only cleans the text.
+        """
+        budget = self.token_budget if token_budget is None else token_budget
+        sections = self.prepare(text)
+
+        # The untitled lead section (name, contact, headline) is always kept first;
+        # without a query the remaining sections keep their original order
+        order = list(range(len(sections)))
+        if query:
+            query_terms = self.terms(query)
+            order.sort(key=lambda i: (
+                sections[i].name != HEADER,
+                -len(sections[i].terms & query_terms) / (1 + len(sections[i].terms)) ** 0.5,
+            ))
+
+        kept = {}
+        remaining = budget if budget > 0 else float("inf")
+        for i in order:
+            section = sections[i]
+            if section.tokens <= remaining:
+                kept[i] = section.lines
+                remaining -= section.tokens
+            elif remaining > 0:
+                # Keep the leading lines of a section that does not fit
+                lines = []
+                for line in section.lines:
+                    cost = estimate_tokens(line + "\n")
+                    if cost > remaining:
+                        break
+                    lines.append(line)
+                    remaining -= cost
+                # A heading on its own tells the model nothing
+                if len(lines) > (section.name != HEADER):
+                    kept[i] = lines
+                else:
+                    remaining += sum(estimate_tokens(line + "\n") for line in lines)
+
+        # Emit in document order so the model still reads a coherent resume
+        return "\n".join(line for i in sorted(kept) for line in kept[i])
+
+
+_default_compressor = None
+_compressor_lock = threading.Lock()
+
+
+def get_compressor(registry=None):
+    """Returns the process-wide compressor shared by the LLM-backed components.
+
+    Components built on another registry get a compressor of their own on it,
+    so no second spaCy pipeline is loaded.
+    """
+    global _default_compressor
+    if registry is not None and registry is not get_registry():
+        return ResumeCompressor(registry=registry)
+    with _compressor_lock:
+        if _default_compressor is None:
+            _default_compressor = ResumeCompressor()
+        return _default_compressor
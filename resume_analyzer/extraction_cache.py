@@ -0,0 +1,162 @@
+# extraction_cache.py
+# Content-addressed cache for text extracted from resume files
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from instrumentation import cache_lookup
+
+
+class ExtractionCache:
+    """Two-tier (memory LRU + disk) cache of extraction results keyed by SHA-256 of the file bytes.
+
+    Entries are plain dicts ({"text", "page_count", "pages"}). The disk tier
+    is optional and evicts least recently used files once it grows past
+    max_disk_bytes.
+    """
+
+    def __init__(self, directory=None, max_entries=128, max_disk_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._hashes = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._disk_bytes = sum(entry.stat().st_size for entry in self._disk_entries())
+
+    @staticmethod
+    def hash_file(file_path, chunk_size=1024 * 1024):
+        sha256 = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    @staticmethod
+    def _memo_key(file_path):
+        stat = os.stat(file_path)
+        return os.path.realpath(file_path), stat.st_size, stat.st_mtime_ns
+
+    def key_for(self, file_path):
+        """Returns the content hash of a file, remembering it while the file is unchanged."""
+        memo_key = self._memo_key(file_path)
+        with self._lock:
+            key = self._hashes.get(memo_key)
+            if key is not None:
+                self._hashes.move_to_end(memo_key)
+                return key
+
+        key = self.hash_file(file_path)
+        self.remember(file_path, key)
+        return key
+
+    def remember(self, file_path, key):
+        """Records a hash computed elsewhere (e.g. while the file was being written)."""
+        memo_key = self._memo_key(file_path)
+        with self._lock:
+            self._hashes[memo_key] = key
+            if len(self._hashes) > self.max_entries:
+                self._hashes.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                cache_lookup("extraction", hit=True)
+                return result
+
+        result = self._read_disk(key)
+        if result is None:
+            self.misses += 1
+            cache_lookup("extraction", hit=False)
+            return None
+
+        self.hits += 1
+        cache_lookup("extraction", hit=True)
+        self._remember(key, result)
+        return result
+
+    def put(self, key, result):
+        self._remember(key, result)
+        self._write_disk(key, result)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._hashes.clear()
+        for entry in self._disk_entries():
+            os.remove(entry.path)
+        self._disk_bytes = 0
+
+    def _remember(self, key, result):
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _disk_entries(self):
+        if not self.directory:
+            return []
+        return [entry for entry in os.scandir(self.directory) if entry.name.endswith(".json")]
+
+    def _read_disk(self, key):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Touch the file so eviction sees it as recently used
+        os.utime(path)
+        return result
+
+    def _write_disk(self, key, result):
+        if not self.directory:
+            return
+        path = self._path(key)
+        # Write then rename so readers in other processes never see a partial file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        os.replace(tmp_path, path)
+
+        self._disk_bytes += os.path.getsize(path)
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict()
+
+    def _evict(self):
+        # Rescan rather than trust the running total: other workers share the directory
+        entries = []
+        for entry in self._disk_entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._disk_bytes = total
@@ -1,88 +1,241 @@
 import os
+import logging
+import threading
+import multiprocessing
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import xml.etree.ElementTree as ET
-import pdfplumber
-import docx
+from extraction_cache import ExtractionCache
+from pdf_backends import PdfiumBackend, PdfPlumberBackend, needs_layout_fallback
+from instrumentation import timed
+
+logger = logging.getLogger("resume_analyzer.file_handling")
 
 class FileHandler:
+    # Shared by every caller in the process; set EXTRACTION_CACHE_DIR to add a disk tier
+    # that survives restarts and is shared between workers, or set to None to disable.
+    cache = ExtractionCache(directory=os.environ.get("EXTRACTION_CACHE_DIR"))
+
+    # PDFs go through the fast backend first; the layout backend only runs when
+    # the fast result looks empty or garbled (see pdf_backends.needs_layout_fallback)
+    pdf_backend = PdfiumBackend()
+    layout_pdf_backend = PdfPlumberBackend()
+
+    # Long PDFs are split into page ranges extracted by a shared process pool.
+    # Pages past max_pdf_pages are not extracted at all, so one huge portfolio
+    # cannot monopolize the workers; the result is then marked "truncated".
+    # Processes that are themselves pool workers set parallel_pages to False
+    # (see disable_parallel_pages), since they cannot start a pool of their own.
+    max_pdf_pages = int(os.environ.get("PDF_MAX_PAGES", 60))
+    pdf_workers = int(os.environ.get("PDF_WORKERS", min(4, os.cpu_count() or 1)))
+    parallel_page_threshold = 8
+    parallel_pages = True
+    _page_pool = None
+    _page_pool_lock = threading.Lock()
+
     @staticmethod
     def extract_text(file_path):
-        import os
-
-        file_extension = os.path.splitext(file_path)[1]
         """Extract text from a DOCX or PDF file."""
-        print(f"Processing file: {file_path}")  # Debugging line
-        file_extension = os.path.splitext(file_path)[1].lower()
-        print(f"Detected extension: {file_extension}")  # Debugging line
-
-        if file_extension == ".docx":   
-            return FileHandler.extract_text_from_docx(file_path)
-        elif file_extension == ".pdf":
-            return FileHandler.extract_text_from_pdf(file_path)
-        if not file_extension:
-            file_extension = ".pdf"  # or ".docx" based on expected input
-            return FileHandler.extract_text_from_pdf(file_path)
-        else:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Processing file: %s (extension %r)", file_path, os.path.splitext(file_path)[1].lower())
+        return FileHandler.extract(file_path)["text"]
+
+    @staticmethod
+    @timed("extract")
+    def extract(file_path):
+        """Extract text, page count, per-page text and whether pages were skipped, reusing the cached result for identical file contents."""
+        file_extension = os.path.splitext(file_path)[1].lower() or ".pdf"  # No extension: assume PDF
+        if file_extension not in (".pdf", ".docx"):
             raise ValueError(f"Unsupported file type: {file_extension}. Please provide a '.docx' or '.pdf' file.")
 
+        cache = FileHandler.cache
+        key = FileHandler._cache_key(file_path)
+        if key is not None:
+            result = cache.get(key)
+            if result is not None:
+                return result
+
+        if file_extension == ".pdf":
+            try:
+                pages, backend, page_count = FileHandler._read_pdf_pages(file_path)
+            except Exception as e:
+                # Failures are returned as text, as before, but never cached
+                return {"text": f"Error reading PDF file: {str(e)}", "page_count": None, "pages": [], "backend": None,
+                        "truncated": False}
+            text = "\n".join(page for page in pages if page).strip()
+            truncated = page_count > len(pages)
+            if truncated:
+                logger.warning("Only the first %d of %d pages of %s were extracted", len(pages), page_count, file_path)
+            result = {
+                "text": text if text else "No readable text found in the PDF.",
+                "page_count": page_count,
+                "pages": pages,
+                "backend": backend,
+                "truncated": truncated
+            }
+        else:
+            try:
+                text = FileHandler._read_docx(file_path)
+            except Exception as e:
+                return {"text": f"Error reading DOCX file: {str(e)}", "page_count": None, "pages": [], "backend": None,
+                        "truncated": False}
+            result = {
+                "text": text if text else "No readable text found in the document.",
+                "page_count": FileHandler._docx_page_count(file_path),
+                "pages": [text],
+                "backend": "python-docx",
+                "truncated": False
+            }
+
+        if key is not None:
+            cache.put(key, result)
+        return result
+
+    @staticmethod
+    def _cache_key(file_path):
+        if FileHandler.cache is None:
+            return None
+        try:
+            return FileHandler.cache.key_for(file_path)
+        except OSError:
+            return None  # Unreadable file: let the extractor report the error
+
     @staticmethod
     def extract_text_from_docx(docx_path):
         """Extract text from a DOCX file, including tables."""
         try:
-            doc = docx.Document(docx_path)  # Load DOCX file
-            text_list = []
-
-            # Extract text from paragraphs
-            for para in doc.paragraphs:
-                if para.text.strip():
-                    text_list.append(para.text.strip())
-
-            # Extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    row_text = [cell.text.strip() for cell in row.cells if cell.text.strip()]
-                    if row_text:
-                        text_list.append(" | ".join(row_text))  # Format table data
-
-            return "\n".join(text_list) if text_list else "No readable text found in the document."
+            text = FileHandler._read_docx(docx_path)
+            return text if text else "No readable text found in the document."
         except Exception as e:
             return f"Error reading DOCX file: {str(e)}"
 
+    @staticmethod
+    def _read_docx(docx_path):
+        import docx
+
+        doc = docx.Document(docx_path)  # Load DOCX file
+        text_list = []
+
+        # Extract text from paragraphs
+        for para in doc.paragraphs:
+            if para.text.strip():
+                text_list.append(para.text.strip())
+
+        # Extract text from tables
+        for table in doc.tables:
+            for row in table.rows:
+                row_text = [cell.text.strip() for cell in row.cells if cell.text.strip()]
+                if row_text:
+                    text_list.append(" | ".join(row_text))  # Format table data
+
+        return "\n".join(text_list)
+
     @staticmethod
     def extract_text_from_pdf(pdf_path):
-        """Extract text from a PDF file using pdfplumber, handling missing text."""
+        """Extract text from a PDF file, falling back to pdfplumber for complex layouts."""
         try:
-            text = ""
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    extracted_text = page.extract_text()
-                    if extracted_text:
-                        text += extracted_text + "\n"
-            return text.strip() if text else "No readable text found in the PDF."
+            pages, _, _ = FileHandler._read_pdf_pages(pdf_path)
+            text = "\n".join(page for page in pages if page).strip()
+            return text if text else "No readable text found in the PDF."
         except Exception as e:
             return f"Error reading PDF file: {str(e)}"
 
+    @staticmethod
+    def _read_pdf_pages(pdf_path):
+        """Returns the per-page text, the name of the backend that produced it and the total page count."""
+        fast = FileHandler.pdf_backend
+        if fast is not None and fast.available():
+            try:
+                page_count = fast.page_count(pdf_path)
+                pages = FileHandler._extract_pages(fast, pdf_path, page_count)
+                if not needs_layout_fallback(pages):
+                    return pages, fast.name, page_count
+            except Exception:
+                pass  # Let the layout backend try, and report its error if it fails too
+
+        layout = FileHandler.layout_pdf_backend
+        page_count = layout.page_count(pdf_path)
+        return FileHandler._extract_pages(layout, pdf_path, page_count), layout.name, page_count
+
+    @staticmethod
+    def _extract_pages(backend, pdf_path, page_count):
+        stop = min(page_count, FileHandler.max_pdf_pages)
+        workers = min(FileHandler.pdf_workers, stop)
+
+        if stop <= FileHandler.parallel_page_threshold or workers <= 1 or not FileHandler.parallel_pages:
+            return backend.extract_pages(pdf_path, 0, stop)
+
+        chunk = -(-stop // workers)
+        starts = list(range(0, stop, chunk))
+        stops = [min(start + chunk, stop) for start in starts]
+        pool = FileHandler._get_page_pool()
+        try:
+            results = list(pool.map(backend.extract_pages, [pdf_path] * len(starts), starts, stops))
+        except BrokenProcessPool:
+            # A page worker died (e.g. out of memory); later files get a fresh pool, this one is read here
+            FileHandler._drop_page_pool(pool)
+            logger.warning("A PDF page worker died; extracting %s in this process", pdf_path)
+            return backend.extract_pages(pdf_path, 0, stop)
+        # Join the ranges once, in page order
+        return [page for pages in results for page in pages]
+
+    @staticmethod
+    def _get_page_pool():
+        with FileHandler._page_pool_lock:
+            if FileHandler._page_pool is None:
+                # Spawned, never forked: the Flask and Streamlit processes are threaded and may hold an LLM client
+                FileHandler._page_pool = ProcessPoolExecutor(
+                    max_workers=FileHandler.pdf_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return FileHandler._page_pool
+
+    @staticmethod
+    def _drop_page_pool(broken):
+        with FileHandler._page_pool_lock:
+            if FileHandler._page_pool is broken:
+                FileHandler._page_pool = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
     @staticmethod
     def get_file_page_count(file_path):
         """Get the number of pages in a DOCX or PDF file."""
         file_extension = os.path.splitext(file_path)[1].lower()
+
+        # An earlier extract() of the same contents already knows the answer
+        key = FileHandler._cache_key(file_path) if file_extension in (".pdf", ".docx") else None
+        if key is not None:
+            result = FileHandler.cache.get(key)
+            if result is not None and result["page_count"] is not None:
+                return result["page_count"]
         
         if file_extension == ".pdf":
             try:
-                with pdfplumber.open(file_path) as pdf:
-                    return len(pdf.pages)
+                backend = FileHandler.pdf_backend
+                if backend is None or not backend.available():
+                    backend = FileHandler.layout_pdf_backend
+                return backend.page_count(file_path)
             except Exception:
                 return "Page count not available (PDF may be corrupted)."
         
         elif file_extension == ".docx":
-            try:
-                with zipfile.ZipFile(file_path) as docx_zip:
-                    xml_content = docx_zip.read("docProps/app.xml")
-                    root = ET.fromstring(xml_content)
-                    pages = root.find("{http://schemas.openxmlformats.org/officeDocument/2006/extended-properties}Pages")
-                    return int(pages.text) if pages is not None else "Page count not available"
-            except (KeyError, zipfile.BadZipFile):
-                return "Page count not available (DOCX may be corrupted)."
+            return FileHandler._docx_page_count(file_path)
         
         else:
             return "Unsupported file type. Please provide a '.docx' or '.pdf' file."
+
+    @staticmethod
+    def _docx_page_count(file_path):
+        try:
+            with zipfile.ZipFile(file_path) as docx_zip:
+                xml_content = docx_zip.read("docProps/app.xml")
+                root = ET.fromstring(xml_content)
+                pages = root.find("{http://schemas.openxmlformats.org/officeDocument/2006/extended-properties}Pages")
+                return int(pages.text) if pages is not None else "Page count not available"
+        except (KeyError, zipfile.BadZipFile):
+            return "Page count not available (DOCX may be corrupted)."
+
+
+def disable_parallel_pages():
+    """Extracts PDF pages in this process only; called when a process pool worker starts."""
+    FileHandler.parallel_pages = False
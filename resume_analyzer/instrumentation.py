@@ -0,0 +1,246 @@
+# instrumentation.py
+# Stage timings, counters and histograms, served in the Prometheus text format
+#
+#   with timed("extract"):              # or @timed("ats_score") on a function
+#       ...
+#   count("resume_cache_requests_total", cache="extraction", result="hit")
+#
+# Everything lives in one in-process registry; app.py serves it on /metrics.
+# Worker processes drain() their samples after each job and the parent
+# merge()s them, so one scrape of the web process covers the whole pool.
+# With the "resume_analyzer.metrics" logger at DEBUG (LOG_LEVEL=DEBUG) every
+# timed stage is also logged as one JSON line.
+
+import bisect
+import json
+import logging
+import threading
+import time
+from functools import wraps
+
+# Seconds; covers a cached lookup (ms) up to a slow Gemini call or huge PDF
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+logger = logging.getLogger("resume_analyzer.metrics")
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value)) if value != float("inf") else "+Inf"
+
+
+class Counter:
+    """A monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name, help=""):
+        self.name = name
+        self.help = help
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self.values.get(_label_key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            return dict(self.values)
+
+    def merge(self, samples):
+        with self._lock:
+            for key, value in samples.items():
+                self.values[key] = self.values.get(key, 0) + value
+
+    def drain(self):
+        with self._lock:
+            samples, self.values = self.values, {}
+        return samples
+
+    def render(self):
+        return [f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in sorted(self.samples().items())]
+
+
+class Histogram:
+    """Observation counts per bucket plus their sum and count, per label set."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help="", buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts (non-cumulative, last is +Inf), sum, count]
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self.values.get(key)
+            if entry is None:
+                entry = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def count(self, **labels):
+        entry = self.values.get(_label_key(labels))
+        return entry[2] if entry else 0
+
+    def samples(self):
+        with self._lock:
+            return {key: [list(entry[0]), entry[1], entry[2]] for key, entry in self.values.items()}
+
+    def merge(self, samples):
+        with self._lock:
+            for key, (buckets, total, count) in samples.items():
+                entry = self.values.get(key)
+                if entry is None:
+                    entry = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                entry[0] = [a + b for a, b in zip(entry[0], buckets)]
+                entry[1] += total
+                entry[2] += count
+
+    def drain(self):
+        with self._lock:
+            samples, self.values = self.values, {}
+        return samples
+
+    def render(self):
+        lines = []
+        for key, (buckets, total, count) in sorted(self.samples().items()):
+            cumulative = 0
+            for bound, observed in zip(self.buckets + (float("inf"),), buckets):
+                cumulative += observed
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', _format_value(bound))])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named counters and histograms; counter()/histogram() return the existing metric for a name."""
+
+    def __init__(self):
+        self.metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, **options):
+        with self._lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, **options)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, help=""):
+        return self._get(Counter, name, help=help)
+
+    def histogram(self, name, help="", buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help=help, buckets=buckets)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            metrics = sorted(self.metrics.values(), key=lambda metric: metric.name)
+        for metric in metrics:
+            if metric.help:
+                lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def drain(self):
+        """Returns and clears every sample recorded so far, in a picklable form for merge()."""
+        with self._lock:
+            metrics = list(self.metrics.values())
+        drained = []
+        for metric in metrics:
+            samples = metric.drain()
+            if samples:
+                options = {"buckets": metric.buckets} if metric.kind == "histogram" else {}
+                drained.append((metric.kind, metric.name, metric.help, options, samples))
+        return drained
+
+    def merge(self, drained):
+        """Adds samples drained from another registry (e.g. a worker process) to this one."""
+        for kind, name, help, options, samples in drained or ():
+            metric = self.counter(name, help) if kind == "counter" else self.histogram(name, help, **options)
+            metric.merge(samples)
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram("resume_stage_seconds", "Time spent in each pipeline stage")
+
+
+class timed:
+    """Times a block (with timed("parse"): ...) or every call of a function (@timed("parse")).
+
+    The duration is observed in resume_stage_seconds{stage=...} along with
+    any extra labels, and logged when the metrics logger is at DEBUG.
+    """
+
+    def __init__(self, stage, histogram=None, **labels):
+        self.stage = stage
+        self.histogram = histogram or STAGE_SECONDS
+        self.labels = labels
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        self.histogram.observe(seconds, stage=self.stage, **self.labels)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(json.dumps({
+                "stage": self.stage, "seconds": round(seconds, 6), "error": exc_type.__name__ if exc_type else None,
+                **self.labels
+            }))
+        return False
+
+    def __call__(self, func):
+        # A fresh timer per call, so one decorated function can run on many threads
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(self.stage, self.histogram, **self.labels):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+def count(name, amount=1, help="", **labels):
+    """Adds to a counter in the default registry, creating it on first use."""
+    REGISTRY.counter(name, help).inc(amount, **labels)
+
+
+def cache_lookup(cache, hit):
+    count("resume_cache_requests_total", help="Cache lookups by cache and result",
+          cache=cache, result="hit" if hit else "miss")
+
+
+def render_metrics():
+    return REGISTRY.render()
@@ -0,0 +1,143 @@
+# llm_cache.py
+# Response cache for LLM-generated insights and advice
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from instrumentation import cache_lookup
+
+DEFAULT_TTL = float(os.environ.get("LLM_CACHE_TTL", 7 * 24 * 3600))
+DEFAULT_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", 1024))
+
+
+def normalize_text(text):
+    # Whitespace-only differences between extractions should still hit
+    return " ".join((text or "").split())
+
+
+def cache_key(template_version, model, resume_text, query=""):
+    """Key on (prompt template version, model, normalized resume hash, query)."""
+    resume_hash = hashlib.sha256(normalize_text(resume_text).encode("utf-8")).hexdigest()
+    payload = json.dumps([template_version, model, resume_hash, normalize_text(query)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryCache:
+    """In-process LRU cache with a TTL."""
+
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.time():
+                self._entries.pop(key, None)
+                self.misses += 1
+                cache_lookup("llm_response", hit=False)
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            cache_lookup("llm_response", hit=True)
+            return entry[0]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.time() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache:
+    """On-disk LRU cache with a TTL, shared by every worker process pointing at the same file."""
+
+    def __init__(self, path, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_by_access ON responses (last_access)")
+        self.conn.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock, self.conn:
+            row = self.conn.execute("SELECT value, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] < now:
+                if row is not None:
+                    self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                cache_lookup("llm_response", hit=False)
+                return None
+            self.conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            cache_lookup("llm_response", hit=True)
+            return row[0]
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl, now)
+            )
+            # Drop expired entries, then the least recently used beyond the size limit
+            self.conn.execute("DELETE FROM responses WHERE expires_at < ?", (now,))
+            self.conn.execute("""
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+
+    def clear(self):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM responses")
+
+
+_default_cache = None
+_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    # A forked child must open its own SQLite connection, not share the parent's handle
+    global _default_cache, _lock
+    _default_cache, _lock = None, threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_response_cache():
+    """Returns the process-wide cache: SQLite when LLM_CACHE_PATH is set, in-memory otherwise."""
+    global _default_cache
+    with _lock:
+        if _default_cache is None:
+            path = os.environ.get("LLM_CACHE_PATH")
+            _default_cache = SQLiteCache(path) if path else MemoryCache()
+        return _default_cache
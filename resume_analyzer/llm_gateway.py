@@ -0,0 +1,221 @@
+# llm_gateway.py
+# Shared LLM client with a global concurrency cap and rate limit
+
+import asyncio
+import os
+import threading
+import time
+from contextlib import contextmanager
+from instrumentation import REGISTRY, timed
+
+DEFAULT_MODEL = "gemini-1.5-flash-latest"
+MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", 8))
+REQUESTS_PER_MINUTE = float(os.environ.get("LLM_REQUESTS_PER_MINUTE", 60))
+# Point the Gemini client at another endpoint, e.g. a local fake server in tests
+API_ENDPOINT = os.environ.get("GEMINI_API_ENDPOINT")
+# Per-request deadline and retries on the Gemini client, so a hung call frees its thread
+# after at most REQUEST_TIMEOUT * (MAX_RETRIES + 1) seconds
+REQUEST_TIMEOUT = float(os.environ.get("LLM_REQUEST_TIMEOUT", 25))
+MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", 1))
+# Reported in place of insights and advice when no API key is configured
+LLM_DISABLED_MESSAGE = "LLM features are disabled: set GEMINI_API_KEY to enable insights and career advice"
+
+LLM_REQUESTS = REGISTRY.counter("resume_llm_requests_total", "LLM calls by model and outcome")
+LLM_TOKENS = REGISTRY.counter("resume_llm_tokens_total", "LLM tokens by model and direction (input/output)")
+
+
+class TokenBucket:
+    """Allows `rate` requests per second on average, with bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        if rate <= 0:
+            raise ValueError(f"Token bucket rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self):
+        # Returns 0 if a token was taken, otherwise how long to wait for one
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        wait = self._take()
+        while wait:
+            time.sleep(wait)
+            wait = self._take()
+
+    async def acquire_async(self):
+        wait = self._take()
+        while wait:
+            await asyncio.sleep(wait)
+            wait = self._take()
+
+
+class LLMGateway:
+    """One chat model client shared by every LLM-backed component.
+
+    Sync and async calls draw from the same concurrency semaphore and token
+    bucket, so bursts from any caller stay under the provider's limits.
+    `llm` can be any LangChain chat model, which is how tests swap in a fake.
+    """
+
+    def __init__(self, llm, max_concurrency=MAX_CONCURRENCY, requests_per_minute=REQUESTS_PER_MINUTE, native_async=True):
+        self.llm = llm
+        self.native_async = native_async
+        self.max_concurrency = max_concurrency
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        # requests_per_minute <= 0 turns the rate limit off (the concurrency cap still applies)
+        self.bucket = TokenBucket(requests_per_minute / 60, capacity=max(1, max_concurrency)) if requests_per_minute > 0 else None
+
+    @property
+    def model_name(self):
+        return getattr(self.llm, "model", None) or getattr(self.llm, "model_name", None) or type(self.llm).__name__
+
+    def invoke(self, messages):
+        """Sends one prompt and returns the reply text."""
+        self._acquire()
+        try:
+            with self._call():
+                reply = self.llm.invoke(messages)
+            self._record_usage([reply])
+            return reply.content
+        finally:
+            self._semaphore.release()
+
+    async def ainvoke(self, messages):
+        await self._acquire_async()
+        try:
+            with self._call():
+                if not self.native_async:
+                    reply = await asyncio.to_thread(self.llm.invoke, messages)
+                else:
+                    reply = await self.llm.ainvoke(messages)
+            self._record_usage([reply])
+            return reply.content
+        finally:
+            self._semaphore.release()
+
+    def stream(self, messages):
+        """Yields the reply text chunk by chunk as the model produces it."""
+        self._acquire()
+        chunks = []
+        try:
+            with self._call():
+                for chunk in self.llm.stream(messages):
+                    chunks.append(chunk)
+                    if chunk.content:
+                        yield chunk.content
+        finally:
+            self._semaphore.release()
+            self._record_usage(chunks)
+
+    async def astream(self, messages):
+        await self._acquire_async()
+        chunks = []
+        try:
+            with self._call():
+                async for chunk in self.llm.astream(messages):
+                    chunks.append(chunk)
+                    if chunk.content:
+                        yield chunk.content
+        finally:
+            self._semaphore.release()
+            self._record_usage(chunks)
+
+    def _acquire(self):
+        # Time spent queueing for a slot under the concurrency cap and rate limit
+        with timed("llm_wait", model=self.model_name):
+            self._semaphore.acquire()
+            try:
+                if self.bucket is not None:
+                    self.bucket.acquire()
+            except BaseException:
+                self._semaphore.release()
+                raise
+
+    async def _acquire_async(self):
+        with timed("llm_wait", model=self.model_name):
+            # Poll rather than block a thread on the shared semaphore, so waiting stays cancellable
+            while not self._semaphore.acquire(blocking=False):
+                await asyncio.sleep(0.01)
+            try:
+                if self.bucket is not None:
+                    await self.bucket.acquire_async()
+            except BaseException:
+                self._semaphore.release()
+                raise
+
+    @contextmanager
+    def _call(self):
+        model = self.model_name
+        try:
+            with timed("llm_call", model=model):
+                yield
+        except (GeneratorExit, asyncio.CancelledError):
+            # The caller stopped reading (e.g. a client disconnected mid-stream)
+            LLM_REQUESTS.inc(model=model, outcome="cancelled")
+            raise
+        except BaseException:
+            LLM_REQUESTS.inc(model=model, outcome="error")
+            raise
+        LLM_REQUESTS.inc(model=model, outcome="ok")
+
+    def _record_usage(self, messages):
+        # Streaming replies report usage on some chunks only, so sum over all of them
+        usage = {"input": 0, "output": 0}
+        for message in messages:
+            metadata = getattr(message, "usage_metadata", None) or {}
+            for kind in usage:
+                usage[kind] += metadata.get(f"{kind}_tokens") or 0
+        for kind, tokens in usage.items():
+            if tokens:
+                LLM_TOKENS.inc(tokens, model=self.model_name, kind=kind)
+
+    async def abatch(self, prompts, return_exceptions=False):
+        """Sends many prompts concurrently (still bounded by the gateway limits)."""
+        return await asyncio.gather(*(self.ainvoke(messages) for messages in prompts), return_exceptions=return_exceptions)
+
+    def batch(self, prompts, return_exceptions=False):
+        return asyncio.run(self.abatch(prompts, return_exceptions=return_exceptions))
+
+
+_gateways = {}
+_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    # A forked child must build its own client; the parent's gRPC channel is not fork-safe
+    global _gateways, _lock
+    _gateways, _lock = {}, threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_gateway(api_key, model=DEFAULT_MODEL):
+    """Returns the process-wide gateway for a model and API key, creating its client once."""
+    key = (model, api_key)
+    with _lock:
+        gateway = _gateways.get(key)
+        if gateway is None:
+            # The Google client libraries take a while to import; only pay for it once a gateway is needed
+            from langchain_google_genai import ChatGoogleGenerativeAI
+
+            options = {}
+            if API_ENDPOINT:
+                options = {"client_options": {"api_endpoint": API_ENDPOINT}, "transport": "rest"}
+            llm = ChatGoogleGenerativeAI(model=model, google_api_key=api_key, timeout=REQUEST_TIMEOUT,
+                                         max_retries=MAX_RETRIES, **options)
+            # The async Gemini client only speaks gRPC, so a REST endpoint override
+            # serves async calls from the sync client on worker threads
+            gateway = _gateways[key] = LLMGateway(llm, native_async=not API_ENDPOINT)
+        return gateway
@@ -0,0 +1,64 @@
+# nlp_registry.py
+# Shared spaCy pipelines, loaded once per process
+
+import threading
+from instrumentation import timed
+
+DEFAULT_MODEL = "en_core_web_sm"
+
+# Components to leave out of each reduced pipeline. Excluded components are
+# never loaded, so a "tokenizer" pipeline carries no model weights at all.
+PROFILES = {
+    "full": (),
+    "ner": ("tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter"),
+    "tokenizer": ("tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter", "ner"),
+    # Document vectors: static vectors where the model has them, tok2vec output otherwise
+    "vectors": ("tagger", "parser", "attribute_ruler", "lemmatizer", "senter", "ner"),
+}
+
+
+class NLPRegistry:
+    def __init__(self, model=DEFAULT_MODEL):
+        self.model = model
+        self._pipelines = {}
+        self._lock = threading.Lock()
+
+    def get(self, profile="full", model=None):
+        """Returns the shared pipeline for a model/profile, loading it on first use."""
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown pipeline profile: {profile}. Choose from {', '.join(PROFILES)}.")
+
+        key = (model or self.model, profile)
+        nlp = self._pipelines.get(key)
+        if nlp is None:
+            with self._lock:
+                # Another thread may have finished loading while we waited
+                nlp = self._pipelines.get(key)
+                if nlp is None:
+                    # Imported here so importing the registry (and everything using it) stays cheap
+                    import spacy
+
+                    with timed("model_load", model=key[0], profile=profile):
+                        nlp = spacy.load(key[0], exclude=list(PROFILES[profile]))
+                    self._pipelines[key] = nlp
+        return nlp
+
+    def loaded(self):
+        """Lists the (model, profile) pairs currently held in memory."""
+        return list(self._pipelines)
+
+    def clear(self):
+        with self._lock:
+            self._pipelines.clear()
+
+
+_default_registry = NLPRegistry()
+
+
+def get_registry():
+    """Returns the process-wide registry shared by all components."""
+    return _default_registry
+
+
+def get_nlp(profile="full", model=None):
+    return _default_registry.get(profile, model)
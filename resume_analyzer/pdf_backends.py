@@ -0,0 +1,87 @@
+# pdf_backends.py
+# Pluggable PDF text extraction backends
+
+import importlib.util
+
+
+class PdfBackend:
+    """Extracts one text string per page of a PDF, optionally for a page range."""
+    name = None
+
+    def available(self):
+        return True
+
+    def page_count(self, pdf_path):
+        raise NotImplementedError
+
+    def extract_pages(self, pdf_path, start=0, stop=None):
+        raise NotImplementedError
+
+
+class PdfiumBackend(PdfBackend):
+    """Fast path: PDFium's native text layer, without layout analysis."""
+    name = "pypdfium2"
+
+    def available(self):
+        return importlib.util.find_spec("pypdfium2") is not None
+
+    def page_count(self, pdf_path):
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def extract_pages(self, pdf_path, start=0, stop=None):
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            pages = []
+            for index in range(start, len(pdf) if stop is None else min(stop, len(pdf))):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                pages.append(textpage.get_text_range().replace("\r\n", "\n").replace("\r", "\n"))
+                textpage.close()
+                page.close()
+            return pages
+        finally:
+            pdf.close()
+
+
+class PdfPlumberBackend(PdfBackend):
+    """Slow path: pdfplumber's full layout analysis."""
+    name = "pdfplumber"
+
+    def page_count(self, pdf_path):
+        import pdfplumber
+
+        with pdfplumber.open(pdf_path) as pdf:
+            return len(pdf.pages)
+
+    def extract_pages(self, pdf_path, start=0, stop=None):
+        import pdfplumber
+
+        with pdfplumber.open(pdf_path) as pdf:
+            # Layout analysis happens in extract_text, so only the requested pages pay for it
+            return [page.extract_text() or "" for page in pdf.pages[start:stop]]
+
+
+def needs_layout_fallback(pages, min_chars_per_page=100, max_fragment_ratio=0.5):
+    """Decides whether a fast-path result is too poor to keep.
+
+    True when the text is (nearly) empty, contains undecodable glyphs, or is
+    mostly one- or two-character line fragments, which is how multi-column
+    layouts and text drawn glyph by glyph come out without layout analysis.
+    """
+    text = "\n".join(pages)
+    if len(text.strip()) < min_chars_per_page * max(len(pages), 1):
+        return True
+    if "\ufffd" in text or "(cid:" in text:
+        return True
+
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    fragments = sum(1 for line in lines if len(line) <= 2)
+    return bool(lines) and fragments / len(lines) > max_fragment_ratio
@@ -0,0 +1,138 @@
+# ranking_engine.py
+# Vectorized job-to-many-resumes keyword ranking
+
+from collections import Counter
+import numpy as np
+from scipy import sparse
+from nlp_registry import get_registry
+from resume_document import ResumeDocument
+
+
+class RankingEngine:
+    """Keeps indexed resumes as a sparse term-count matrix over one shared vocabulary.
+
+    Scores are the same clipped keyword overlap JobMatcher computes, for the
+    whole corpus at once: sum(min(resume_count, job_count)) over the job's
+    keywords, divided by the number of distinct job keywords.
+    """
+
+    def __init__(self, registry=None):
+        self.registry = registry or get_registry()
+        self.nlp = self.registry.get("tokenizer")
+        self.vocabulary = {}
+        self.terms = []
+        self.resume_ids = []
+        self._matrix = sparse.csr_matrix((0, 0), dtype=np.int32)
+        self._columns = None
+        self._pending = []
+
+    def __len__(self):
+        return len(self.resume_ids)
+
+    def _keywords(self, text):
+        return [token.text.lower() for token in self.nlp(text) if token.is_alpha]
+
+    def add(self, resume, resume_id=None):
+        """Indexes one resume (text or ResumeDocument)."""
+        keywords = resume.keywords if isinstance(resume, ResumeDocument) else self._keywords(resume)
+        self._add_keywords(keywords, resume_id)
+
+    def add_many(self, resumes, resume_ids=None, batch_size=256, n_process=1):
+        """Indexes many resumes, tokenizing raw texts through nlp.pipe."""
+        resumes = list(resumes)
+        resume_ids = list(resume_ids) if resume_ids is not None else [None] * len(resumes)
+
+        texts = ((r, i) for i, r in enumerate(resumes) if not isinstance(r, ResumeDocument))
+        keywords = {
+            i: [token.text.lower() for token in doc if token.is_alpha]
+            for doc, i in self.nlp.pipe(texts, as_tuples=True, batch_size=batch_size, n_process=n_process)
+        }
+        for i, resume in enumerate(resumes):
+            self._add_keywords(keywords[i] if i in keywords else resume.keywords, resume_ids[i])
+
+    def _add_keywords(self, keywords, resume_id):
+        counts = Counter()
+        for term in keywords:
+            column = self.vocabulary.get(term)
+            if column is None:
+                column = self.vocabulary[term] = len(self.terms)
+                self.terms.append(term)
+            counts[column] += 1
+        self._pending.append(counts)
+        self.resume_ids.append(len(self.resume_ids) if resume_id is None else resume_id)
+
+    def build(self):
+        """Folds pending resumes into the matrix. Called automatically before scoring."""
+        if not self._pending and self._columns is not None:
+            return
+
+        indptr = [0]
+        indices = []
+        data = []
+        for counts in self._pending:
+            indices.extend(counts.keys())
+            data.extend(counts.values())
+            indptr.append(len(indices))
+
+        shape = (len(self._pending), len(self.terms))
+        new_rows = sparse.csr_matrix(
+            (np.array(data, dtype=np.int32), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+            shape=shape
+        )
+        matrix = self._matrix
+        matrix.resize((matrix.shape[0], len(self.terms)))
+        self._matrix = sparse.vstack([matrix, new_rows], format="csr")
+        self._pending = []
+        # Scoring slices whole columns, which CSC makes proportional to their size
+        self._columns = self._matrix.tocsc()
+
+    def scores(self, job_description):
+        """Returns the match score (0-100) of every indexed resume as a NumPy array."""
+        scores, _, _ = self._score(job_description)
+        return scores
+
+    def rank(self, job_description, top_k=10):
+        """Returns the top_k resumes for a job description, best first."""
+        # argpartition needs 0 <= top_k - 1 < len(scores)
+        if top_k <= 0 or not len(self):
+            return []
+        scores, columns, submatrix = self._score(job_description)
+
+        top_k = min(top_k, len(scores))
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        # Sort by score, then by insertion order for stable ties
+        top = top[np.lexsort((top, -scores[top]))]
+
+        matched = submatrix.tocsr()[top]
+        results = []
+        for row, i in enumerate(top):
+            terms = columns[matched.indices[matched.indptr[row]:matched.indptr[row + 1]]]
+            results.append({
+                "resume_id": self.resume_ids[i],
+                "match_score": float(scores[i]),
+                "matched_keywords": [self.terms[t] for t in terms]
+            })
+        return results
+
+    def rank_many(self, job_descriptions, top_k=10):
+        """Ranks the corpus against each job description in turn."""
+        return [self.rank(job_description, top_k=top_k) for job_description in job_descriptions]
+
+    def _score(self, job_description):
+        self.build()
+        job_counts = Counter(self._keywords(job_description))
+        total_keywords = len(job_counts)
+
+        known = [(self.vocabulary[t], c) for t, c in job_counts.items() if t in self.vocabulary]
+        columns = np.array([column for column, _ in known], dtype=np.int64)
+        caps = np.array([count for _, count in known], dtype=np.int32)
+
+        n_resumes = self._matrix.shape[0]
+        submatrix = self._columns[:, columns]
+        if total_keywords == 0:
+            return np.zeros(n_resumes), columns, submatrix
+
+        # Clip each resume count at the job's count for that keyword, then sum per resume
+        clipped = np.minimum(submatrix.data, np.repeat(caps, np.diff(submatrix.indptr)))
+        overlap = np.bincount(submatrix.indices, weights=clipped, minlength=n_resumes)
+        return overlap / total_keywords * 100, columns, submatrix
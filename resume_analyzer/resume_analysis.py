@@ -1,11 +1,8 @@
 import streamlit as st
-import os
-import tempfile
-import matplotlib.pyplot as plt
 from io import BytesIO
-from fpdf import FPDF
-from file_handling import FileHandler
-from GenAI_module import ResumeAnalyzer  # Fixed incorrect import
+from streamlit_resources import (
+    load_llm_components, upload_digest, extract_resume, parse_resume, extract_skills, start_warmup
+)
 
 # Apply Custom CSS  
 def local_css():
@@ -22,6 +19,8 @@ def local_css():
 # Initialize UI
 st.set_page_config(page_title="AI Resume Analyzer", layout="wide")
 local_css()
+# Models load in the background while the page renders
+start_warmup()
 
 st.markdown('<p class="main-title">📄 AI-Powered Resume Analyzer</p>', unsafe_allow_html=True)
 
@@ -36,41 +35,35 @@ api_key = st.text_input("🔑 Enter your GEMINI API Key:", type="password")
 
 # Process the Uploaded File
 if uploaded_file is not None:
-    temp_dir = tempfile.TemporaryDirectory()
-    temp_file_path = os.path.join(temp_dir.name, uploaded_file.name)
-
-    with open(temp_file_path, "wb") as temp_file:
-        temp_file.write(uploaded_file.read())
-
-    # Extract text from the resume (Hidden from UI)
+    # Extract text from the resume (Hidden from UI), cached by the upload's hash
     try:
-        file_handler = FileHandler()
-        resume_text = file_handler.extract_text(temp_file_path)  # ✅ Extract text but do NOT display
+        digest = upload_digest(uploaded_file)
+        extracted = extract_resume(digest, uploaded_file)
+        resume_text = extracted["text"]  # ✅ Extract text but do NOT display
 
         # Display basic resume details
-        page_count = file_handler.get_file_page_count(temp_file_path)
-        st.success(f"✅ Resume Uploaded Successfully | Total Pages: {page_count}")
+        st.success(f"✅ Resume Uploaded Successfully | Total Pages: {extracted['page_count']}")
 
         # Check API Key
         if api_key:
-            chatbot = ResumeAnalyzer(api_key)
-
-            # Show Progress Spinner
-            with st.spinner("🔍 Analyzing resume for career insights..."):
-                insights = chatbot.get_resume_insights(resume_text)
+            # Loaded once per API key and reused by every rerun and session
+            chatbot = load_llm_components(api_key)[1]
 
-            # Display Resume Insights
-            with st.expander("📊 Resume Insights (Click to Expand)"):
-                st.write(insights)
+            # Display Resume Insights, rendered token by token as they arrive
+            with st.expander("📊 Resume Insights (Click to Expand)", expanded=True):
+                insights = st.write_stream(chatbot.stream_resume_insights(resume_text))
 
             # Generate and Display Skills Analysis
             st.subheader("📌 Skills Analysis")
-            skills_proficiency = chatbot.extract_skills(resume_text)
+            skills_proficiency = extract_skills(digest, parse_resume(digest, resume_text), chatbot)
 
             if skills_proficiency:
                 skills = list(skills_proficiency.keys())
                 proficiency = list(skills_proficiency.values())
 
+                # Imported on first chart, not on every page load
+                import matplotlib.pyplot as plt
+
                 fig, ax = plt.subplots(figsize=(8, 4))
                 ax.barh(skills, proficiency, color='skyblue')
                 ax.set_xlabel('Proficiency (%)')
@@ -81,6 +74,8 @@ if uploaded_file is not None:
 
             # Download Resume Insights as PDF
             def create_pdf(insights_text):
+                from fpdf import FPDF
+
                 pdf = FPDF()
                 pdf.add_page()
                 pdf.set_font("Arial", size=12)
@@ -122,8 +117,6 @@ if uploaded_file is not None:
 
     except Exception as e:
         st.error(f"❌ Error processing the file: {e}")
-
-    temp_dir.cleanup()
 else:
     st.info("📂 Please upload a resume to get started.")
 
@@ -0,0 +1,75 @@
+# resume_document.py
+# Resume parsed once, shared by every analyzer
+
+from file_handling import FileHandler
+from nlp_registry import get_registry
+from resume_sections import segment
+from resume_features import ResumeFeatures
+from instrumentation import timed
+
+
+class ResumeDocument:
+    def __init__(self, text, doc, source=None):
+        self.text = text
+        self.doc = doc
+        self.source = source
+        self.tokens = [token.text for token in doc]
+        self.entities = [(ent.text, ent.label_) for ent in doc.ents]
+        self._keywords = None
+        self._features = {}
+
+    @classmethod
+    def from_text(cls, text, registry=None, source=None):
+        """Runs the NER pipeline over the text exactly once."""
+        nlp = (registry or get_registry()).get("ner")
+        with timed("parse"):
+            return cls(text, nlp(text), source=source)
+
+    @classmethod
+    def from_file(cls, file_path, registry=None):
+        """Builds a document from FileHandler output for a PDF or DOCX file."""
+        text = FileHandler.extract_text(file_path)
+        return cls.from_text(text, registry=registry, source=file_path)
+
+    @property
+    def keywords(self):
+        """Lowercase alphabetic tokens, as used for keyword matching."""
+        if self._keywords is None:
+            self._keywords = [token.lower_ for token in self.doc if token.is_alpha]
+        return self._keywords
+
+    @property
+    def sections(self):
+        """Experience, education, skills, ... sections of the text, segmented once."""
+        return segment(self.text)
+
+    def section_spans(self, names):
+        """Token spans of the named sections within the parsed doc."""
+        names = set(names)
+        spans = []
+        for section in self.sections:
+            if section.name in names:
+                span = self.doc.char_span(section.start, section.end, alignment_mode="expand")
+                if span is not None:
+                    spans.append(span)
+        return spans
+
+    def keywords_in(self, names):
+        """Like keywords, restricted to the named sections."""
+        return [token.lower_ for span in self.section_spans(names) for token in span if token.is_alpha]
+
+    def features(self, sections=None):
+        """Keyword counts and readability for scoring, computed once per section filter."""
+        key = tuple(sorted(sections)) if sections is not None else None
+        features = self._features.get(key)
+        if features is None:
+            keywords = self.keywords if sections is None else self.keywords_in(sections)
+            features = self._features[key] = ResumeFeatures.from_keywords(keywords, self.text)
+        return features
+
+    def to_dict(self):
+        return {
+            "text": self.text,
+            "entities": self.entities,
+            "sections": [section.to_dict() for section in self.sections]
+        }
@@ -0,0 +1,56 @@
+# resume_features.py
+# Resume-side scoring features, computed once per resume
+
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+
+
+def readability_score(text):
+    # Readability Score (basic approximation based on sentence length)
+    sentences = text.split(".")
+    avg_sentence_length = sum(len(sent.split()) for sent in sentences) / max(len(sentences), 1)
+    return max(100 - avg_sentence_length, 0)
+
+
+class ResumeFeatures:
+    """Everything job matching and ATS scoring need from a resume.
+
+    Once built, scoring against a new job description only tokenizes the job
+    description and intersects counters.
+    """
+
+    def __init__(self, keywords, readability_score):
+        self.counts = Counter(keywords)
+        self.readability_score = readability_score
+
+    @classmethod
+    def from_keywords(cls, keywords, text):
+        return cls(keywords, readability_score(text))
+
+
+class FeatureCache:
+    """Small LRU of ResumeFeatures keyed by resume text hash (and section filter)."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(text, sections=None):
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return digest, tuple(sorted(sections)) if sections is not None else None
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            features = self._entries.get(key)
+            if features is not None:
+                self._entries.move_to_end(key)
+                return features
+        features = compute()
+        with self._lock:
+            self._entries[key] = features
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return features
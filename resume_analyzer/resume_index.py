@@ -0,0 +1,193 @@
+# resume_index.py
+# Persistent inverted index of parsed resumes for job-description search
+
+import hashlib
+import sqlite3
+import time
+from collections import Counter
+from nlp_registry import get_registry
+from resume_document import ResumeDocument
+from skill_taxonomy import SkillTaxonomy, get_skill_matcher
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    content_hash TEXT PRIMARY KEY,
+    source TEXT,
+    n_keywords INTEGER NOT NULL,
+    added_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resumes_by_source ON resumes (source);
+CREATE TABLE IF NOT EXISTS postings (
+    kind TEXT NOT NULL,
+    term TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (kind, term, content_hash)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_by_resume ON postings (content_hash);
+"""
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResumeIndex:
+    """On-disk (SQLite) inverted index over the features JobMatcher and extract_skills use.
+
+    Postings hold lowercase alphabetic tokens ("keyword") and taxonomy skills
+    ("skill") per resume content hash, so a new job description is answered
+    from the posting lists without re-extracting or re-parsing any resume.
+    """
+
+    def __init__(self, path, registry=None, taxonomy=None):
+        self.path = path
+        self.registry = registry or get_registry()
+        self.nlp = self.registry.get("tokenizer")
+        self.skill_matcher = get_skill_matcher(taxonomy or SkillTaxonomy.default(), self.nlp)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        # WAL lets other processes search while we write
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+    def __contains__(self, resume_hash):
+        return self.conn.execute("SELECT 1 FROM resumes WHERE content_hash = ?", (resume_hash,)).fetchone() is not None
+
+    def _features(self, doc):
+        keywords = Counter(token.lower_ for token in doc if token.is_alpha)
+        matches = self.skill_matcher.find([token.lower_ for token in doc])
+        skills = Counter(self.skill_matcher.skills[skill_id].lower() for skill_id, _, _ in matches)
+        return keywords, skills
+
+    def _insert(self, text, doc, source):
+        resume_hash = content_hash(text)
+        if resume_hash in self:
+            if source is not None:
+                self.conn.execute("UPDATE resumes SET source = ? WHERE content_hash = ?", (source, resume_hash))
+            return resume_hash
+
+        keywords, skills = self._features(doc)
+        self.conn.execute(
+            "INSERT INTO resumes (content_hash, source, n_keywords, added_at) VALUES (?, ?, ?, ?)",
+            (resume_hash, source, sum(keywords.values()), time.time())
+        )
+        self.conn.executemany(
+            "INSERT INTO postings (kind, term, content_hash, count) VALUES (?, ?, ?, ?)",
+            [("keyword", term, resume_hash, count) for term, count in keywords.items()]
+            + [("skill", skill, resume_hash, count) for skill, count in skills.items()]
+        )
+        return resume_hash
+
+    def _prepare(self, resume, source):
+        if isinstance(resume, ResumeDocument):
+            return resume.text, resume.doc, source or resume.source
+        return resume, self.nlp(resume), source
+
+    def add(self, resume, source=None):
+        """Indexes a resume (text or ResumeDocument) and returns its content hash.
+
+        Adding the same content twice is a no-op apart from updating its source.
+        """
+        text, doc, source = self._prepare(resume, source)
+        with self.conn:
+            return self._insert(text, doc, source)
+
+    def add_many(self, resumes, sources=None, batch_size=256):
+        """Indexes many resumes in a single transaction, tokenizing raw texts through nlp.pipe."""
+        resumes = list(resumes)
+        sources = list(sources) if sources is not None else [None] * len(resumes)
+
+        texts = ((r, i) for i, r in enumerate(resumes) if not isinstance(r, ResumeDocument))
+        docs = {i: doc for doc, i in self.nlp.pipe(texts, as_tuples=True, batch_size=batch_size)}
+
+        hashes = []
+        with self.conn:
+            for i, resume in enumerate(resumes):
+                if isinstance(resume, ResumeDocument):
+                    hashes.append(self._insert(resume.text, resume.doc, sources[i] or resume.source))
+                else:
+                    hashes.append(self._insert(resume, docs[i], sources[i]))
+        return hashes
+
+    def update(self, source, resume):
+        """Replaces whatever is indexed for a source (e.g. a file path) with new content."""
+        text, doc, source = self._prepare(resume, source)
+        with self.conn:
+            old_hashes = [row[0] for row in self.conn.execute("SELECT content_hash FROM resumes WHERE source = ?", (source,))]
+            for resume_hash in old_hashes:
+                self._delete(resume_hash)
+            return self._insert(text, doc, source)
+
+    def delete(self, resume_hash):
+        """Removes a resume and its postings. Returns False if it was not indexed."""
+        with self.conn:
+            return self._delete(resume_hash)
+
+    def _delete(self, resume_hash):
+        self.conn.execute("DELETE FROM postings WHERE content_hash = ?", (resume_hash,))
+        return self.conn.execute("DELETE FROM resumes WHERE content_hash = ?", (resume_hash,)).rowcount > 0
+
+    def search(self, job_description, top_k=10, required_skills=None):
+        """Ranks indexed resumes against a job description with JobMatcher's keyword score.
+
+        Only resumes sharing at least one job keyword are touched. With
+        required_skills, candidates are first narrowed to the intersection of
+        those skills' posting lists.
+        """
+        # SQLite reads a negative LIMIT as no limit at all
+        if top_k <= 0:
+            return []
+        job_keywords = Counter(token.lower_ for token in self.nlp(job_description) if token.is_alpha)
+        if not job_keywords:
+            return []
+
+        values = ", ".join(["(?, ?)"] * len(job_keywords))
+        params = [value for item in job_keywords.items() for value in item]
+        skill_filter = ""
+        if required_skills:
+            skills = sorted({skill.lower() for skill in required_skills})
+            skill_filter = f"""
+                AND p.content_hash IN (
+                    SELECT content_hash FROM postings
+                    WHERE kind = 'skill' AND term IN ({", ".join(["?"] * len(skills))})
+                    GROUP BY content_hash HAVING COUNT(*) = ?
+                )"""
+            params += skills + [len(skills)]
+
+        rows = self.conn.execute(f"""
+            WITH job(term, cap) AS (VALUES {values})
+            SELECT p.content_hash, r.source, SUM(MIN(p.count, job.cap)) AS overlap, GROUP_CONCAT(p.term, ' ')
+            FROM postings p
+            JOIN job ON p.term = job.term
+            JOIN resumes r ON r.content_hash = p.content_hash
+            WHERE p.kind = 'keyword' {skill_filter}
+            GROUP BY p.content_hash
+            ORDER BY overlap DESC, r.added_at
+            LIMIT ?
+        """, params + [top_k]).fetchall()
+
+        return [{
+            "content_hash": resume_hash,
+            "source": source,
+            "match_score": overlap / len(job_keywords) * 100,
+            "matched_keywords": terms.split(" ")
+        } for resume_hash, source, overlap, terms in rows]
+
+    def skills(self, resume_hash):
+        """Returns the indexed skill counts for one resume."""
+        rows = self.conn.execute(
+            "SELECT term, count FROM postings WHERE kind = 'skill' AND content_hash = ?", (resume_hash,)
+        )
+        return dict(rows)
@@ -1,50 +1,134 @@
-import spacy
 import os
-from file_handling import FileHandler
+import logging
+import multiprocessing
+from file_handling import FileHandler, disable_parallel_pages
+from nlp_registry import get_registry
+from resume_document import ResumeDocument
+
+logger = logging.getLogger("resume_analyzer.resume_parser")
+
+# Pipeline of a parse_many worker process, sent once by the pool initializer
+_worker_nlp = None
+
+
+def _init_parse_worker(nlp):
+    global _worker_nlp
+    _worker_nlp = nlp
+    disable_parallel_pages()
+
+
+def _parse_file(file_path):
+    # Extraction and parsing both run in the worker; the Doc travels back as bytes
+    text, error = ResumeParser._extract(file_path)
+    if error is not None:
+        return None, error
+    return _worker_nlp(text).to_bytes(), None
+
 
 class ResumeParser:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
+    def __init__(self, registry=None):
+        self.registry = registry or get_registry()
         self.file_handler = FileHandler()
 
-    def parse_resume(self, file_path):
-        """Extracts text and key entities from a resume."""
+    @property
+    def nlp(self):
+        # Entities are all a ResumeDocument reads beyond tokens, so tagger, parser and
+        # lemmatizer are never loaded; JobMatcher never parses through us
+        return self.registry.get("ner")
+
+    def parse_resume(self, resume):
+        """Extracts text and key entities from a resume file path or ResumeDocument."""
+        if not isinstance(resume, ResumeDocument):
+            resume = self.parse_document(resume)
+        return resume.to_dict()
+
+    def parse_document(self, file_path):
+        """Extracts text from a resume file and parses it once into a ResumeDocument."""
+        logger.debug("Processing file: %s", file_path)
+        
+        self._validate(file_path)
+        
+        # Extract text from the file
+        resume_text = self.file_handler.extract_text(file_path)
         
-        # Print the file path for debugging
-        print("Processing file:", file_path)
+        # Process text with NLP
+        doc = self.nlp(resume_text)
         
+        return ResumeDocument(resume_text, doc, source=file_path)
+
+    def parse_many(self, file_paths, batch_size=32, n_process=1):
+        """Parses many resume files, yielding ResumeDocuments in input order as they finish.
+
+        With n_process > 1 (or -1 for every core) each file is extracted and
+        parsed by one of n_process spawned workers, each holding a copy of the
+        pipeline. Files that are missing, unsupported or unreadable are logged
+        and skipped; the rest still parse.
+        """
+        file_paths = list(file_paths)
+        if n_process == 1:
+            yield from self._parse_serial(file_paths, batch_size)
+            return
+
+        from spacy.tokens import Doc
+
+        nlp = self.nlp
+        pool = multiprocessing.get_context("spawn").Pool(
+            os.cpu_count() if n_process == -1 else n_process, initializer=_init_parse_worker, initargs=(nlp,)
+        )
+        try:
+            parsed = pool.imap(_parse_file, file_paths, chunksize=max(1, batch_size // 4))
+            for file_path, (data, error) in zip(file_paths, parsed):
+                if error is not None:
+                    logger.warning("Skipping %s: %s", file_path, error)
+                    continue
+                doc = Doc(nlp.vocab).from_bytes(data)
+                yield ResumeDocument(doc.text, doc, source=file_path)
+        finally:
+            pool.terminate()
+
+    def _parse_serial(self, file_paths, batch_size):
+        def texts():
+            for file_path in file_paths:
+                text, error = self._extract(file_path)
+                if error is not None:
+                    logger.warning("Skipping %s: %s", file_path, error)
+                    continue
+                yield text, file_path
+
+        for doc, file_path in self.nlp.pipe(texts(), as_tuples=True, batch_size=batch_size):
+            yield ResumeDocument(doc.text, doc, source=file_path)
+
+    @staticmethod
+    def _extract(file_path):
+        # Returns (text, None) or (None, error message), so one bad file does not end the batch
+        try:
+            ResumeParser._validate(file_path)
+            return FileHandler.extract_text(file_path), None
+        except Exception as e:
+            return None, str(e)
+
+    @staticmethod
+    def _validate(file_path):
         # Check if the file exists
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
         
         # Extract file extension
         file_extension = os.path.splitext(file_path)[1].lower()
-        print("Detected extension:", file_extension)  # Debugging
+        logger.debug("Detected extension: %s", file_extension)
         
         # Validate file extension
         if file_extension not in [".pdf", ".docx"]:
             raise ValueError(f"Unsupported file type: {file_extension}. Please provide a '.docx' or '.pdf' file.")
-        
-        # Extract text from the file
-        resume_text = self.file_handler.extract_text(file_path)
-        
-        # Process text with NLP
-        doc = self.nlp(resume_text)
-        
-        # Return extracted entities
-        return {
-            "text": resume_text,
-            "entities": [(ent.text, ent.label_) for ent in doc.ents]
-        }
 
 if __name__ == "__main__":
     parser = ResumeParser()
     
     # Change this to the actual file path you are using
-
+    sample_resume = "sample_resume.pdf"
     
     try:
-        result = parser.parse_resume()
+        result = parser.parse_resume(sample_resume)
         print(result)
     except Exception as e:
         print("Error:", e)
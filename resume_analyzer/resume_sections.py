@@ -0,0 +1,84 @@
+# resume_sections.py
+# Splits extracted resume text into titled sections
+
+import re
+from functools import lru_cache
+
+# Canonical section name -> headings that introduce it
+SECTION_ALIASES = {
+    "summary": ("summary", "profile", "objective", "about me", "professional summary", "career objective"),
+    "experience": ("experience", "work experience", "professional experience", "employment history",
+                   "work history", "employment", "internships"),
+    "education": ("education", "academic background", "qualifications", "academic qualifications"),
+    "skills": ("skills", "technical skills", "core competencies", "key skills", "competencies", "tools"),
+    "projects": ("projects", "personal projects", "academic projects", "key projects"),
+    "certifications": ("certifications", "certificates", "licenses", "courses"),
+    "awards": ("awards", "achievements", "honors", "honours"),
+    "publications": ("publications",),
+    "languages": ("languages",),
+    "interests": ("interests", "hobbies", "volunteering"),
+    "references": ("references",),
+}
+HEADINGS = {alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+# The untitled block before the first heading (name, contact details, headline)
+HEADER = "header"
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+# Years are limited to 1900-2099 so numbers like "5000 users" or "1024 GB" are not read as dates
+_YEAR = r"(?:19|20)\d{2}"
+_DATE = rf"(?:{_MONTH}\s+{_YEAR}|\d{{1,2}}/{_YEAR}|{_YEAR})"
+DATE_PATTERN = re.compile(
+    rf"\b{_DATE}(?:\s*(?:-|–|—|to)\s*(?:{_DATE}|present|current|now))?\b",
+    re.I
+)
+
+
+def section_name(line):
+    """Returns the canonical section a heading line introduces, or None for ordinary lines."""
+    heading = " ".join(line.strip().strip(":").split()).lower()
+    return HEADINGS.get(heading) if len(heading) <= 40 else None
+
+
+class ResumeSection:
+    def __init__(self, name, heading, text, start, end):
+        self.name = name
+        self.heading = heading
+        self.text = text
+        # Character offsets into the full resume text
+        self.start = start
+        self.end = end
+        self.dates = [match.group(0) for match in DATE_PATTERN.finditer(text)]
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "heading": self.heading,
+            "start": self.start,
+            "end": self.end,
+            "dates": self.dates
+        }
+
+
+@lru_cache(maxsize=256)
+def segment(text):
+    """Splits resume text into sections at recognised headings, computed once per distinct text."""
+    sections = []
+    name, heading, start = HEADER, None, 0
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        found = section_name(line)
+        if found is not None:
+            if text[start:offset].strip():
+                sections.append(ResumeSection(name, heading, text[start:offset], start, offset))
+            name, heading, start = found, line.strip(), offset
+        offset += len(line)
+    if text[start:].strip():
+        sections.append(ResumeSection(name, heading, text[start:], start, len(text)))
+    return tuple(sections)
+
+
+def section_text(text, names):
+    """Joins the text of the named sections, in document order."""
+    names = set(names)
+    return "\n".join(section.text for section in segment(text) if section.name in names)
@@ -0,0 +1,328 @@
+# semantic_matching.py
+# Embedding-based resume matching with a local nearest-neighbour index
+
+import json
+import logging
+import os
+import threading
+import numpy as np
+from nlp_registry import get_registry
+from resume_document import ResumeDocument
+from resume_sections import segment
+from resume_index import content_hash
+
+DEFAULT_SENTENCE_MODEL = "all-MiniLM-L6-v2"
+# Sections embedded on their own in addition to the whole resume
+EMBEDDED_SECTIONS = ("summary", "experience", "skills", "projects", "education")
+
+logger = logging.getLogger("resume_analyzer.semantic_matching")
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class SpacyEncoder:
+    """Document vectors from a spaCy pipeline: static word vectors for the md/lg
+    models, averaged tok2vec output for the small ones. No extra dependency."""
+
+    def __init__(self, registry=None, model=None, batch_size=64):
+        self.registry = registry or get_registry()
+        self.model = model
+        self.batch_size = batch_size
+        self.name = f"spacy:{model or self.registry.model}"
+
+    @property
+    def nlp(self):
+        return self.registry.get("vectors", self.model)
+
+    def encode(self, texts):
+        vectors = [doc.vector for doc in self.nlp.pipe(texts, batch_size=self.batch_size)]
+        if not vectors:
+            return np.zeros((0, 0), dtype=np.float32)
+        return _normalize(vectors)
+
+
+class SentenceTransformerEncoder:
+    """A small CPU sentence encoder (sentence-transformers, optional dependency)."""
+
+    def __init__(self, model_name=DEFAULT_SENTENCE_MODEL, batch_size=64):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise ImportError("The sentence encoder needs sentence-transformers: pip install sentence-transformers")
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.batch_size = batch_size
+        self.name = f"sentence-transformers:{model_name}"
+
+    def encode(self, texts):
+        return _normalize(self.model.encode(list(texts), batch_size=self.batch_size, convert_to_numpy=True))
+
+
+def get_encoder(kind="auto", registry=None):
+    """"spacy", "sentence-transformers", or "auto" (the sentence encoder when installed)."""
+    if kind == "sentence-transformers" or kind == "auto":
+        try:
+            return SentenceTransformerEncoder()
+        except Exception as e:
+            if kind != "auto":
+                raise
+            if not isinstance(e, ImportError):
+                # Installed but unusable, e.g. the model cannot be downloaded offline
+                logger.warning("Falling back to spaCy vectors: %s", e)
+    if kind in ("spacy", "auto"):
+        return SpacyEncoder(registry=registry)
+    raise ValueError(f"Unknown encoder: {kind}. Choose from spacy, sentence-transformers, auto.")
+
+
+class NumpyANN:
+    """Exact inner-product search over a dense matrix; the fallback when no ANN library is installed."""
+
+    name = "numpy"
+
+    def __init__(self, dim):
+        self.dim = dim
+        self._chunks = []
+        self._matrix = np.zeros((0, dim), dtype=np.float32)
+
+    def add(self, vectors):
+        self._chunks.append(vectors)
+
+    def search(self, query, k):
+        if self._chunks:
+            self._matrix = np.vstack([self._matrix] + self._chunks)
+            self._chunks = []
+        k = min(k, len(self._matrix))
+        if k == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        scores = self._matrix @ query
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return top, scores[top]
+
+
+class HnswANN:
+    name = "hnswlib"
+
+    def __init__(self, dim, M=16, ef_construction=200):
+        import hnswlib
+        self.index = hnswlib.Index(space="ip", dim=dim)
+        self.index.init_index(max_elements=1024, M=M, ef_construction=ef_construction)
+        self.count = 0
+
+    def add(self, vectors):
+        needed = self.count + len(vectors)
+        if needed > self.index.get_max_elements():
+            self.index.resize_index(max(needed, 2 * self.index.get_max_elements()))
+        self.index.add_items(vectors, np.arange(self.count, needed))
+        self.count = needed
+
+    def search(self, query, k):
+        k = min(k, self.count)
+        if k == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        self.index.set_ef(max(2 * k, 50))
+        labels, distances = self.index.knn_query(query, k=k)
+        # hnswlib's "ip" distance is 1 - inner product
+        return labels[0].astype(np.int64), 1 - distances[0]
+
+
+class FaissANN:
+    name = "faiss"
+
+    def __init__(self, dim, M=32):
+        import faiss
+        self.index = faiss.IndexHNSWFlat(dim, M, faiss.METRIC_INNER_PRODUCT)
+
+    def add(self, vectors):
+        self.index.add(np.ascontiguousarray(vectors, dtype=np.float32))
+
+    def search(self, query, k):
+        k = min(k, self.index.ntotal)
+        if k == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        self.index.hnsw.efSearch = max(2 * k, 64)
+        scores, labels = self.index.search(query.reshape(1, -1).astype(np.float32), k)
+        return labels[0].astype(np.int64), scores[0]
+
+
+ANN_BACKENDS = {"hnswlib": HnswANN, "faiss": FaissANN, "numpy": NumpyANN}
+
+
+def make_ann(dim, backend="auto"):
+    """Builds an index with the requested backend; "auto" tries hnswlib, then faiss, then NumPy."""
+    if backend != "auto":
+        return ANN_BACKENDS[backend](dim)
+    for cls in (HnswANN, FaissANN):
+        try:
+            return cls(dim)
+        except ImportError:
+            continue
+    return NumpyANN(dim)
+
+
+class SemanticIndex:
+    """Stores resume and section embeddings once and finds the closest resumes to a job description.
+
+    Whole resumes and their main sections (see EMBEDDED_SECTIONS) get one
+    vector each. Re-adding an unchanged resume is free; a changed one is
+    re-embedded and its old vectors are ignored. save()/load() keep the
+    vectors on disk so a restart does not re-encode the pool.
+    """
+
+    def __init__(self, encoder=None, backend="auto", sections=EMBEDDED_SECTIONS):
+        self.encoder = encoder or get_encoder("auto")
+        self.backend = backend
+        self.sections = tuple(sections)
+        self.hashes = {}
+        # Row metadata, aligned with the vectors: (resume_id, section or None)
+        self.rows = []
+        self._vectors = []
+        self._stale = set()
+        self._ann = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def __contains__(self, resume_id):
+        return resume_id in self.hashes
+
+    def add(self, resume, resume_id=None):
+        return self.add_many([resume], [resume_id])[0]
+
+    def add_many(self, resumes, resume_ids=None):
+        """Embeds new or changed resumes (texts or ResumeDocuments) in one encoder batch; returns their IDs."""
+        resumes = list(resumes)
+        resume_ids = list(resume_ids) if resume_ids is not None else [None] * len(resumes)
+
+        texts, rows, ids, digests = [], [], [], {}
+        for resume, resume_id in zip(resumes, resume_ids):
+            text = resume.text if isinstance(resume, ResumeDocument) else resume
+            digest = content_hash(text)
+            resume_id = resume_id if resume_id is not None else digest
+            ids.append(resume_id)
+            if self.hashes.get(resume_id) == digest:
+                continue
+            texts.append(text)
+            rows.append((resume_id, None))
+            for section in segment(text):
+                if section.name in self.sections:
+                    texts.append(section.text)
+                    rows.append((resume_id, section.name))
+            digests[resume_id] = digest
+
+        if texts:
+            vectors = self.encoder.encode(texts)
+            with self._lock:
+                replaced = {resume_id for resume_id, _ in rows}
+                self._stale.update(i for i, (resume_id, _) in enumerate(self.rows) if resume_id in replaced)
+                self._append(rows, vectors)
+                self.hashes.update(digests)
+        return ids
+
+    def _append(self, rows, vectors):
+        self.rows.extend(rows)
+        self._vectors.append(vectors)
+        # The ANN index is built on first search, then kept up to date
+        if self._ann is not None:
+            self._ann.add(vectors)
+
+    def _get_ann(self):
+        with self._lock:
+            if self._ann is None and self._vectors:
+                vectors = self.vectors
+                self._ann = make_ann(vectors.shape[1], self.backend)
+                self._ann.add(vectors)
+            return self._ann
+
+    @property
+    def vectors(self):
+        if len(self._vectors) > 1:
+            self._vectors = [np.vstack(self._vectors)]
+        return self._vectors[0] if self._vectors else np.zeros((0, 0), dtype=np.float32)
+
+    def search(self, job_description, top_k=10, by="resume"):
+        """Top resumes by cosine similarity to the job description.
+
+        by="resume" compares whole resumes; by="section" scores each resume by
+        its best-matching section and reports which section that was.
+        """
+        ann = self._get_ann()
+        if ann is None:
+            return []
+        query = self.encoder.encode([job_description])[0]
+
+        # Over-fetch, since rows of the other kind and stale rows are skipped
+        fetch = top_k * (len(self.sections) + 2) + len(self._stale)
+        while True:
+            labels, scores = ann.search(query, fetch)
+            best = {}
+            for label, score in zip(labels, scores):
+                if label < 0 or label in self._stale:
+                    continue
+                resume_id, section = self.rows[label]
+                if (section is None) != (by == "resume"):
+                    continue
+                if resume_id not in best or score > best[resume_id][0]:
+                    best[resume_id] = (float(score), section)
+            if len(best) >= top_k or fetch >= len(self.rows):
+                break
+            fetch *= 4
+
+        ranked = sorted(best.items(), key=lambda item: item[1][0], reverse=True)[:top_k]
+        return [
+            {"resume_id": resume_id, "similarity": score, "section": section}
+            for resume_id, (score, section) in ranked
+        ]
+
+    def save(self, directory):
+        """Writes vectors and metadata to a directory."""
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "vectors.npy"), self.vectors)
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "encoder": self.encoder.name,
+                "sections": self.sections,
+                "hashes": self.hashes,
+                "rows": self.rows,
+                "stale": sorted(int(i) for i in self._stale)
+            }, f)
+
+    @classmethod
+    def load(cls, directory, encoder=None, backend="auto"):
+        """Loads a saved index; the encoder must be the one the vectors were made with."""
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        # Without an explicit encoder, rebuild the kind the vectors were made with
+        encoder = encoder or get_encoder(meta["encoder"].split(":")[0])
+        index = cls(encoder=encoder, backend=backend, sections=meta["sections"])
+        if index.encoder.name != meta["encoder"]:
+            raise ValueError(f"Index was built with {meta['encoder']}, not {index.encoder.name}.")
+        index.hashes = meta["hashes"]
+        index.rows = [(resume_id, section) for resume_id, section in meta["rows"]]
+        index._stale = set(meta["stale"])
+        vectors = np.load(os.path.join(directory, "vectors.npy"))
+        if len(vectors):
+            index._vectors = [vectors]
+        return index
+
+
+class SemanticMatcher:
+    """Drop-in alternative to JobMatcher.match_resume_to_job that scores by embedding similarity."""
+
+    def __init__(self, encoder=None):
+        self.encoder = encoder or get_encoder("auto")
+
+    def match_resume_to_job(self, resume, job_description, sections=None):
+        text = resume.text if isinstance(resume, ResumeDocument) else resume
+        texts = [job_description, text]
+        if sections is not None:
+            texts += [section.text for section in segment(text) if section.name in sections]
+        vectors = self.encoder.encode(texts)
+        similarities = vectors[1:] @ vectors[0]
+        # Whole resume, or its best section when sections are given
+        similarity = float(similarities[1:].max()) if len(similarities) > 1 else float(similarities[0])
+        return {"match_score": max(similarity, 0.0) * 100, "similarity": similarity}
@@ -0,0 +1,178 @@
+# skill_taxonomy.py
+# Skill taxonomies and a precompiled token-level Aho-Corasick skill matcher
+
+import csv
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import deque
+
+DEFAULT_SKILLS = [
+    "Python", "Machine Learning", "Data Analysis", "Project Management",
+    "Leadership", "Java", "C++", "SQL", "Communication", "Teamwork",
+    "Problem Solving", "Deep Learning", "Artificial Intelligence",
+    "Cloud Computing", "Cybersecurity", "Software Development",
+    "Agile Methodologies", "DevOps", "Big Data", "Data Science",
+    "Natural Language Processing", "Computer Vision"
+]
+
+# Column holding the skill name in ESCO / O*NET exports, in order of preference
+SKILL_COLUMNS = ["preferredLabel", "Element Name", "Example", "skill", "name"]
+
+# Set to share compiled matchers on disk between worker processes and restarts
+MATCHER_CACHE_DIR = os.environ.get("SKILL_MATCHER_CACHE_DIR")
+
+
+class SkillTaxonomy:
+    def __init__(self, skills, name="default", version=None):
+        self.skills = list(dict.fromkeys(s.strip() for s in skills if s and s.strip()))
+        self.name = name
+        # Without an explicit version, the content itself identifies the taxonomy
+        self.version = version or hashlib.sha256("\n".join(self.skills).encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def default(cls):
+        return cls(DEFAULT_SKILLS, name="default")
+
+    @classmethod
+    def from_file(cls, path, name=None, version=None, column=None):
+        """Loads skills from a .txt (one per line), .json (list) or .csv/.tsv export."""
+        extension = os.path.splitext(path)[1].lower()
+        name = name or os.path.splitext(os.path.basename(path))[0]
+
+        with open(path, encoding="utf-8", newline="") as f:
+            if extension == ".json":
+                skills = json.load(f)
+            elif extension in (".csv", ".tsv"):
+                reader = csv.DictReader(f, delimiter="\t" if extension == ".tsv" else ",")
+                if column is None:
+                    column = next((c for c in SKILL_COLUMNS if c in reader.fieldnames), reader.fieldnames[0])
+                skills = [row[column] for row in reader]
+            elif extension == ".txt":
+                skills = f.read().splitlines()
+            else:
+                raise ValueError(f"Unsupported taxonomy file type: {extension}. Please provide a '.txt', '.json', '.csv' or '.tsv' file.")
+
+        return cls(skills, name=name, version=version)
+
+    @property
+    def key(self):
+        return f"{self.name}-{self.version}"
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over lowercase token sequences.
+
+    Matching walks each resume token once, so its cost depends on resume
+    length and not on how many skills the taxonomy holds.
+    """
+
+    def __init__(self, phrases):
+        self.skills = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        seen = set()
+        for skill, tokens in phrases:
+            tokens = tuple(tokens)
+            if not tokens or tokens in seen:
+                continue
+            seen.add(tokens)
+            self._insert(tokens, len(self.skills))
+            self.skills.append(skill)
+
+        self._build_failure_links()
+
+    def _insert(self, tokens, skill_id):
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((skill_id, len(tokens)))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(token, 0)
+                # Inherit matches that end here via a shorter suffix
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, tokens):
+        """Returns (skill_id, start, end) for every skill occurring in the lowercase tokens."""
+        goto, fail, output = self._goto, self._fail, self._output
+        matches = []
+        state = 0
+        for i, token in enumerate(tokens):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for skill_id, length in output[state]:
+                matches.append((skill_id, i + 1 - length, i + 1))
+        return matches
+
+
+_matchers = {}
+_lock = threading.Lock()
+
+
+def compile_skill_matcher(taxonomy, nlp):
+    """Tokenizes every skill once with the pipeline's tokenizer and builds the automaton."""
+    phrases = (
+        (skill, [token.lower_ for token in doc])
+        for skill, doc in zip(taxonomy.skills, nlp.tokenizer.pipe(taxonomy.skills))
+    )
+    return SkillMatcher(phrases)
+
+
+def get_skill_matcher(taxonomy, nlp, cache_dir=None):
+    """Returns the compiled matcher for a taxonomy version, compiling it at most once.
+
+    With a cache_dir (default: SKILL_MATCHER_CACHE_DIR) the compiled automaton
+    is also pickled to disk, so new worker processes load it instead of
+    re-tokenizing the taxonomy.
+    """
+    cache_dir = cache_dir or MATCHER_CACHE_DIR
+    key = (taxonomy.key, nlp.meta.get("name"), nlp.meta.get("version"))
+    matcher = _matchers.get(key)
+    if matcher is not None:
+        return matcher
+
+    with _lock:
+        matcher = _matchers.get(key)
+        if matcher is not None:
+            return matcher
+
+        cache_path = None
+        if cache_dir:
+            cache_path = os.path.join(cache_dir, "skill_matcher-{}-{}-{}.pkl".format(*key))
+            if os.path.exists(cache_path):
+                with open(cache_path, "rb") as f:
+                    matcher = pickle.load(f)
+
+        if matcher is None:
+            matcher = compile_skill_matcher(taxonomy, nlp)
+            if cache_path:
+                os.makedirs(cache_dir, exist_ok=True)
+                # Write then rename so concurrent workers never read a partial file
+                tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(matcher, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_path)
+
+        _matchers[key] = matcher
+    return matcher
@@ -0,0 +1,98 @@
+# streamlit_resources.py
+# Analyzers and per-upload results cached across Streamlit reruns and sessions
+#
+# Streamlit re-executes the whole script on every interaction. Models and
+# clients are cached as resources (one instance per model config / API key
+# for the life of the server); extraction and scoring are cached by the
+# SHA-256 of the uploaded bytes, so any session uploading the same file reuses them.
+
+import hashlib
+import threading
+import streamlit as st
+from nlp_registry import NLPRegistry, DEFAULT_MODEL, get_registry
+from llm_gateway import DEFAULT_MODEL as DEFAULT_LLM_MODEL, get_gateway
+from file_handling import FileHandler
+from Job_matcher import JobMatcher
+from ats_scoring import ATSScoring
+from career_coaching import CareerCoach
+from GenAI_module import ResumeAnalyzer
+from resume_document import ResumeDocument
+from upload_handling import UploadedResume
+
+
+@st.cache_resource(show_spinner=False)
+def load_registry(model=DEFAULT_MODEL):
+    registry = get_registry() if model == DEFAULT_MODEL else NLPRegistry(model)
+    # Load both pipelines up front so no later interaction waits for them
+    registry.get("ner")
+    registry.get("tokenizer")
+    return registry
+
+
+def _warm_default_registry():
+    registry = get_registry()
+    registry.get("ner")
+    registry.get("tokenizer")
+
+
+@st.cache_resource(show_spinner=False)
+def start_warmup():
+    """Loads the default spaCy pipelines on a background thread, once per server.
+
+    The page renders (and accepts uploads) while they load; load_registry()
+    then finds them ready, or waits for the load already in progress.
+    """
+    thread = threading.Thread(target=_warm_default_registry, name="model-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+@st.cache_resource(show_spinner="Loading language models...")
+def load_scorers(model=DEFAULT_MODEL):
+    """Returns (JobMatcher, ATSScoring) sharing one set of spaCy pipelines."""
+    registry = load_registry(model)
+    return JobMatcher(registry=registry), ATSScoring(registry=registry)
+
+
+@st.cache_resource(show_spinner=False)
+def load_llm_components(api_key, llm_model=DEFAULT_LLM_MODEL, model=DEFAULT_MODEL):
+    """Returns (CareerCoach, ResumeAnalyzer) for an API key, sharing one gateway."""
+    gateway = get_gateway(api_key, llm_model)
+    registry = load_registry(model)
+    return CareerCoach(api_key, gateway=gateway), ResumeAnalyzer(api_key, registry=registry, gateway=gateway)
+
+
+def upload_digest(uploaded_file):
+    """SHA-256 of an uploaded file's bytes, the key for every per-upload cache below."""
+    return hashlib.sha256(uploaded_file.getbuffer()).hexdigest()
+
+
+@st.cache_data(max_entries=64, show_spinner="📄 Extracting resume text...")
+def extract_resume(digest, _uploaded_file):
+    """Text and page count of an upload (raises ValueError for unsupported or oversized files)."""
+    _uploaded_file.seek(0)
+    with UploadedResume(_uploaded_file, _uploaded_file.name, declared_size=_uploaded_file.size) as upload:
+        extracted = FileHandler.extract(upload.path)
+    return {"text": extracted["text"], "page_count": extracted["page_count"]}
+
+
+@st.cache_resource(max_entries=32, show_spinner="🔍 Extracting resume details...")
+def parse_resume(digest, _text, model=DEFAULT_MODEL):
+    """The parsed ResumeDocument for an upload; shared, so treat it as read-only."""
+    return ResumeDocument.from_text(_text, registry=load_registry(model))
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def score_resume(digest, job_description, _document, model=DEFAULT_MODEL):
+    """Job match and ATS scores for an upload against one job description."""
+    job_matcher, ats_scoring = load_scorers(model)
+    return {
+        "job_match": job_matcher.match_resume_to_job(_document, job_description),
+        "ats": ats_scoring.score_resume(_document, job_description)
+    }
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def extract_skills(digest, _document, _analyzer):
+    """Skill proficiency for an upload (the default taxonomy does not depend on the API key)."""
+    return _analyzer.extract_skills(_document)
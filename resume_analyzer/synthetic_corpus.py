@@ -0,0 +1,130 @@
+# synthetic_corpus.py
+# Reproducible fake resumes (PDF and DOCX, with tables) for benchmarks
+#
+#   python synthetic_corpus.py corpus/ --count 100 --pages 1 2 5 --seed 0
+
+import argparse
+import os
+import random
+import docx
+from fpdf import FPDF
+from skill_taxonomy import DEFAULT_SKILLS
+
+FIRST_NAMES = ["Alex", "Sam", "Priya", "Chen", "Maria", "Tunde", "Olga", "Ravi", "Lena", "Omar"]
+LAST_NAMES = ["Smith", "Kumar", "Garcia", "Ivanova", "Okafor", "Nguyen", "Brown", "Haddad", "Rossi", "Lee"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Analytics", "Hooli"]
+TITLES = ["Software Engineer", "Data Analyst", "Backend Developer", "ML Engineer", "Project Manager", "DevOps Engineer"]
+VERBS = ["Built", "Designed", "Led", "Optimized", "Automated", "Migrated", "Maintained", "Delivered"]
+OBJECTS = ["data pipelines", "REST services", "reporting dashboards", "deployment tooling", "customer analytics",
+           "a recommendation engine", "internal APIs", "test automation", "billing workflows"]
+OUTCOMES = ["reducing latency by {n}%", "serving {n}k daily users", "cutting costs by {n}%",
+            "improving accuracy by {n}%", "for a team of {n} engineers"]
+
+# Roughly how many text lines fit on one page at the sizes used below
+LINES_PER_PAGE = 45
+
+
+class SyntheticResume:
+    """One generated resume as plain sections, plus an optional skills table."""
+
+    def __init__(self, rng, pages=1, table=True):
+        self.name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        self.skills = rng.sample(DEFAULT_SKILLS, k=min(len(DEFAULT_SKILLS), rng.randint(4, 10)))
+        self.table = [(skill, str(rng.randint(1, 10)), rng.choice(["Basic", "Proficient", "Expert"]))
+                      for skill in self.skills] if table else None
+        self.sections = [
+            ("SUMMARY", [f"{rng.choice(TITLES)} with experience in {', '.join(self.skills[:3])}."]),
+            ("SKILLS", [", ".join(self.skills)]),
+            ("EDUCATION", [f"BSc Computer Science, University of {rng.choice(LAST_NAMES)}, {rng.randint(2000, 2020)}"]),
+        ]
+
+        # Experience fills the remaining pages
+        experience = []
+        year = 2024
+        while len(experience) + 12 < pages * LINES_PER_PAGE:
+            start = year - rng.randint(1, 4)
+            experience.append(f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)} ({start} - {year})")
+            for _ in range(rng.randint(3, 6)):
+                outcome = rng.choice(OUTCOMES).format(n=rng.randint(5, 60))
+                skill = rng.choice(self.skills)
+                experience.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} with {skill}, {outcome}.")
+            year = start
+        self.sections.insert(1, ("EXPERIENCE", experience))
+
+    @property
+    def text(self):
+        return "\n".join([self.name] + [line for heading, lines in self.sections for line in [heading] + lines])
+
+    def to_pdf(self, path):
+        pdf = FPDF()
+        pdf.set_auto_page_break(True, margin=15)
+        pdf.add_page()
+        pdf.set_font("Arial", "B", 16)
+        pdf.cell(0, 10, txt=self.name, ln=1)
+        for heading, lines in self.sections:
+            pdf.set_font("Arial", "B", 12)
+            pdf.cell(0, 8, txt=heading, ln=1)
+            pdf.set_font("Arial", size=10)
+            for line in lines:
+                pdf.multi_cell(0, 5, txt=line)
+            if heading == "SKILLS" and self.table:
+                for row in [("Skill", "Years", "Level")] + self.table:
+                    for width, cell in zip((70, 30, 40), row):
+                        pdf.cell(width, 6, txt=cell, border=1)
+                    pdf.ln()
+        pdf.output(path)
+
+    def to_docx(self, path):
+        document = docx.Document()
+        document.add_heading(self.name, level=1)
+        for heading, lines in self.sections:
+            document.add_heading(heading, level=2)
+            for line in lines:
+                document.add_paragraph(line)
+            if heading == "SKILLS" and self.table:
+                table = document.add_table(rows=1, cols=3)
+                for cell, text in zip(table.rows[0].cells, ("Skill", "Years", "Level")):
+                    cell.text = text
+                for row in self.table:
+                    for cell, text in zip(table.add_row().cells, row):
+                        cell.text = text
+        document.save(path)
+
+
+def generate_corpus(directory, count=20, pages=(1, 2, 5), formats=("pdf", "docx"), table_ratio=0.5, seed=0):
+    """Writes count resumes cycling through the page counts and formats; returns their paths.
+
+    The same seed always produces the same corpus.
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i in range(count):
+        page_count = pages[i % len(pages)]
+        file_format = formats[(i // len(pages)) % len(formats)]
+        resume = SyntheticResume(rng, pages=page_count, table=rng.random() < table_ratio)
+        path = os.path.join(directory, f"resume_{i:05d}_{page_count}p.{file_format}")
+        if file_format == "pdf":
+            resume.to_pdf(path)
+        else:
+            resume.to_docx(path)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic PDF/DOCX resumes.")
+    parser.add_argument("directory")
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 2, 5], help="Page counts to cycle through")
+    parser.add_argument("--formats", nargs="+", default=["pdf", "docx"], choices=["pdf", "docx"])
+    parser.add_argument("--table-ratio", type=float, default=0.5, help="Share of resumes with a skills table")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    paths = generate_corpus(args.directory, args.count, tuple(args.pages), tuple(args.formats), args.table_ratio, args.seed)
+    print(f"Wrote {len(paths)} resumes to {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
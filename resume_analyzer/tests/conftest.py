@@ -0,0 +1,29 @@
+# conftest.py
+# Shared fixtures; modules are imported flat from resume_analyzer/, as the app does
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nlp_registry import NLPRegistry
+
+
+class BlankRegistry(NLPRegistry):
+    """Serves one blank English pipeline for every profile, so tests need no downloaded model."""
+
+    def __init__(self):
+        super().__init__(model="blank:en")
+        import spacy
+
+        self.nlp = spacy.blank("en")
+
+    def get(self, profile="full", model=None):
+        return self.nlp
+
+
+@pytest.fixture(scope="session")
+def registry():
+    return BlankRegistry()
@@ -0,0 +1,44 @@
+# test_bulk_screen.py
+
+import json
+
+import pytest
+
+from bulk_screen import Checkpoint
+
+
+@pytest.mark.parametrize("partial", [
+    '{"resume_id": "c", "rows": [{"jo',
+    # Complete JSON, but the newline never made it to disk
+    '{"resume_id": "c", "rows": []}',
+])
+def test_resumes_after_a_truncated_last_line(tmp_path, partial):
+    path = str(tmp_path / "run.checkpoint.jsonl")
+    checkpoint = Checkpoint(path, "jobs-v1")
+    checkpoint.add("a", [{"job": "backend", "match_score": 50.0}])
+    checkpoint.add("b", [{"job": "backend", "match_score": 75.0}])
+    checkpoint.close()
+
+    # Simulate an interruption halfway through writing the next record
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(partial)
+
+    checkpoint = Checkpoint(path, "jobs-v1")
+    assert checkpoint.done == {"a": [{"job": "backend", "match_score": 50.0}], "b": [{"job": "backend", "match_score": 75.0}]}
+    checkpoint.add("c", [])
+    checkpoint.close()
+
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert records[0] == {"jobs": "jobs-v1"}
+    assert [record["resume_id"] for record in records[1:]] == ["a", "b", "c"]
+
+
+def test_rejects_a_checkpoint_for_other_jobs(tmp_path):
+    path = str(tmp_path / "run.checkpoint.jsonl")
+    Checkpoint(path, "jobs-v1").close()
+    with pytest.raises(ValueError):
+        Checkpoint(path, "jobs-v2")
+    checkpoint = Checkpoint(path, "jobs-v2", fresh=True)
+    assert checkpoint.done == {}
+    checkpoint.close()
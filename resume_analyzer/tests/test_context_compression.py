@@ -0,0 +1,8 @@
+# test_context_compression.py
+
+from context_compression import clean_lines
+
+
+def test_drops_page_numbers_but_keeps_numeric_contact_lines():
+    text = "Jane Doe\n5551234567\nPage 2 of 3\n- 2 -\n12\nPython developer\n| Python | SQL |\nPython developer"
+    assert clean_lines(text) == ["Jane Doe", "5551234567", "Python developer", "Python | SQL"]
@@ -0,0 +1,50 @@
+# test_file_handling.py
+
+import multiprocessing
+import os
+
+import pytest
+
+from file_handling import FileHandler
+
+
+class DyingBackend:
+    """Returns placeholder pages in the calling process and kills any pool worker that runs it."""
+
+    name = "dying"
+
+    def extract_pages(self, pdf_path, start, stop):
+        if multiprocessing.parent_process() is not None:
+            os._exit(1)
+        return [f"page {i}" for i in range(start, stop)]
+
+
+@pytest.fixture
+def page_pool(monkeypatch):
+    monkeypatch.setattr(FileHandler, "pdf_workers", 2)
+    monkeypatch.setattr(FileHandler, "parallel_pages", True)
+    yield
+    if FileHandler._page_pool is not None:
+        FileHandler._page_pool.shutdown(cancel_futures=True)
+        FileHandler._page_pool = None
+
+
+def test_dead_page_worker_falls_back_and_replaces_the_pool(page_pool):
+    pages = FileHandler._extract_pages(DyingBackend(), "resume.pdf", 20)
+    assert pages == [f"page {i}" for i in range(20)]
+    assert FileHandler._page_pool is None
+
+    # A later long file starts a fresh pool rather than failing on the broken one
+    assert FileHandler._extract_pages(DyingBackend(), "resume.pdf", 20) == pages
+    assert FileHandler._page_pool is None
+
+
+def test_page_pool_is_spawned(page_pool):
+    assert FileHandler._get_page_pool()._mp_context.get_start_method() == "spawn"
+
+
+def test_short_or_serial_files_skip_the_pool(page_pool, monkeypatch):
+    assert FileHandler._extract_pages(DyingBackend(), "resume.pdf", 5) == [f"page {i}" for i in range(5)]
+    monkeypatch.setattr(FileHandler, "parallel_pages", False)
+    assert len(FileHandler._extract_pages(DyingBackend(), "resume.pdf", 20)) == 20
+    assert FileHandler._page_pool is None
@@ -0,0 +1,34 @@
+# test_genai_module.py
+
+import asyncio
+
+import pytest
+
+from GenAI_module import ResumeAnalyzer
+from llm_gateway import LLM_DISABLED_MESSAGE
+
+
+@pytest.fixture
+def analyzer(registry):
+    pytest.importorskip("langchain")
+    return ResumeAnalyzer(api_key=None, registry=registry)
+
+
+def test_insights_without_a_key_report_llm_disabled(analyzer):
+    assert analyzer.get_resume_insights("Python developer") == LLM_DISABLED_MESSAGE
+    assert list(analyzer.stream_resume_insights("Python developer")) == [LLM_DISABLED_MESSAGE]
+    assert asyncio.run(analyzer.aget_resume_insights("Python developer")) == LLM_DISABLED_MESSAGE
+    results = analyzer.get_resume_insights_many(["a", "b"])
+    assert [(result["index"], result["status"], result["error"]) for result in results] == [
+        (0, "error", LLM_DISABLED_MESSAGE), (1, "error", LLM_DISABLED_MESSAGE)
+    ]
+    with pytest.raises(RuntimeError, match="disabled"):
+        analyzer.get_resume_insights("Python developer", raise_errors=True)
+
+
+def test_skills_work_without_a_key(analyzer):
+    assert "Python" in analyzer.extract_skills("Python and SQL developer")
+
+
+def test_compressor_uses_the_injected_registry(analyzer, registry):
+    assert analyzer.compressor.registry is registry
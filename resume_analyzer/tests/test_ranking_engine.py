@@ -0,0 +1,48 @@
+# test_ranking_engine.py
+
+import pytest
+
+from Job_matcher import JobMatcher
+from ranking_engine import RankingEngine
+
+RESUMES = [
+    "Python developer with SQL and Flask experience. Python, Python everywhere.",
+    "Java engineer: Spring, Kafka and SQL.",
+    "Data scientist using Python, pandas and machine learning.",
+    "Chef with ten years of kitchen experience.",
+]
+JOBS = [
+    "Python developer with SQL and machine learning",
+    "Senior Java engineer, Kafka a plus",
+    "python python sql",
+]
+
+
+@pytest.fixture
+def engine(registry):
+    engine = RankingEngine(registry=registry)
+    engine.add_many(RESUMES, resume_ids=range(len(RESUMES)))
+    return engine
+
+
+@pytest.mark.parametrize("job", JOBS)
+def test_scores_match_job_matcher(engine, registry, job):
+    matcher = JobMatcher(registry=registry)
+    expected = [matcher.match_resume_to_job(resume, job)["match_score"] for resume in RESUMES]
+    assert engine.scores(job).tolist() == pytest.approx(expected)
+
+
+def test_rank_orders_by_score_then_insertion(engine, registry):
+    matcher = JobMatcher(registry=registry)
+    job = JOBS[0]
+    expected = sorted(range(len(RESUMES)), key=lambda i: -matcher.match_resume_to_job(RESUMES[i], job)["match_score"])
+    ranked = engine.rank(job, top_k=len(RESUMES))
+    assert [result["resume_id"] for result in ranked] == expected
+    assert set(ranked[0]["matched_keywords"]) == set(matcher.match_resume_to_job(RESUMES[0], job)["matched_keywords"])
+
+
+def test_rank_handles_small_top_k_and_empty_engine(engine, registry):
+    assert engine.rank(JOBS[0], top_k=0) == []
+    assert engine.rank(JOBS[0], top_k=-1) == []
+    assert len(engine.rank(JOBS[0], top_k=100)) == len(RESUMES)
+    assert RankingEngine(registry=registry).rank(JOBS[0]) == []
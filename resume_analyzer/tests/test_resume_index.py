@@ -0,0 +1,59 @@
+# test_resume_index.py
+
+import pytest
+
+from resume_index import ResumeIndex, content_hash
+from skill_taxonomy import SkillTaxonomy
+
+
+@pytest.fixture
+def index(tmp_path, registry):
+    taxonomy = SkillTaxonomy(["Python", "SQL", "Java"], name="test")
+    with ResumeIndex(str(tmp_path / "index.db"), registry=registry, taxonomy=taxonomy) as index:
+        yield index
+
+
+def test_add_is_idempotent_and_indexes_skills(index):
+    resume_hash = index.add("Python and SQL developer", source="a.pdf")
+    assert index.add("Python and SQL developer", source="b.pdf") == resume_hash
+    assert len(index) == 1
+    assert resume_hash == content_hash("Python and SQL developer")
+    assert index.skills(resume_hash) == {"python": 1, "sql": 1}
+    assert index.search("python")[0]["source"] == "b.pdf"
+
+
+def test_search_ranks_by_keyword_overlap(index):
+    index.add_many(["Python SQL Python", "Java SQL", "Gardening"], sources=["a", "b", "c"])
+    results = index.search("python sql developer")
+    assert [result["source"] for result in results] == ["a", "b"]
+    assert results[0]["match_score"] == pytest.approx(2 / 3 * 100)
+    assert sorted(results[0]["matched_keywords"]) == ["python", "sql"]
+    assert [result["source"] for result in index.search("python sql developer", top_k=1)] == ["a"]
+    assert index.search("python sql developer", top_k=0) == []
+    assert index.search("python sql developer", top_k=-1) == []
+    assert index.search("...") == []
+
+
+def test_search_filters_on_required_skills(index):
+    index.add_many(["Python SQL", "Java SQL", "Python Java SQL"], sources=["a", "b", "c"])
+    assert {result["source"] for result in index.search("sql", required_skills=["Java"])} == {"b", "c"}
+    assert [result["source"] for result in index.search("sql", required_skills=["java", "python"])] == ["c"]
+
+
+def test_update_replaces_content_for_a_source(index):
+    old_hash = index.add("Java developer", source="cv.pdf")
+    new_hash = index.update("cv.pdf", "Python developer")
+    assert old_hash not in index
+    assert new_hash in index
+    assert len(index) == 1
+    assert index.search("java") == []
+    assert index.search("python")[0]["content_hash"] == new_hash
+
+
+def test_delete_removes_resume_and_postings(index):
+    resume_hash = index.add("Python developer", source="cv.pdf")
+    assert index.delete(resume_hash)
+    assert not index.delete(resume_hash)
+    assert len(index) == 0
+    assert index.search("python") == []
+    assert index.skills(resume_hash) == {}
@@ -0,0 +1,56 @@
+# test_resume_parser.py
+
+import pytest
+
+from conftest import BlankRegistry
+from resume_parser import ResumeParser
+
+RESUMES = [
+    "Jane Doe\nPython developer at Acme since 2019.",
+    "John Roe\nJava engineer at Globex, SQL and Kafka.",
+    "Ada Poe\nData scientist at Initech using Python.",
+]
+
+
+@pytest.fixture
+def registry():
+    # Entities come from a rule so the workers' parse can be compared with the in-process one
+    registry = BlankRegistry()
+    ruler = registry.nlp.add_pipe("entity_ruler")
+    ruler.add_patterns([{"label": "ORG", "pattern": name} for name in ("Acme", "Globex", "Initech")])
+    return registry
+
+
+@pytest.fixture
+def resume_files(tmp_path):
+    docx = pytest.importorskip("docx")
+    paths = []
+    for i, text in enumerate(RESUMES):
+        document = docx.Document()
+        for line in text.split("\n"):
+            document.add_paragraph(line)
+        path = str(tmp_path / f"resume_{i}.docx")
+        document.save(path)
+        paths.append(path)
+    return paths
+
+
+def summary(documents):
+    return [(document.source, document.text, document.tokens, document.entities) for document in documents]
+
+
+def test_parallel_parse_matches_serial_in_order(registry, resume_files):
+    parser = ResumeParser(registry=registry)
+    serial = summary(parser.parse_many(resume_files))
+    assert [source for source, *_ in serial] == resume_files
+    assert serial[0][3] == [("Acme", "ORG")]
+    assert summary(parser.parse_many(resume_files, batch_size=1, n_process=2)) == serial
+
+
+@pytest.mark.parametrize("n_process", [1, 2])
+def test_bad_files_are_skipped(registry, resume_files, tmp_path, n_process):
+    text_file = tmp_path / "notes.txt"
+    text_file.write_text("not a resume")
+    paths = [str(tmp_path / "missing.pdf"), resume_files[0], str(text_file), resume_files[1]]
+    parsed = ResumeParser(registry=registry).parse_many(paths, n_process=n_process)
+    assert [document.source for document in parsed] == [resume_files[0], resume_files[1]]
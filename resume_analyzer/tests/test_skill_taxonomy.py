@@ -0,0 +1,59 @@
+# test_skill_taxonomy.py
+
+from skill_taxonomy import SkillMatcher, SkillTaxonomy, compile_skill_matcher
+
+
+def found(matcher, text):
+    return sorted((matcher.skills[skill_id], start, end) for skill_id, start, end in matcher.find(text.split()))
+
+
+def test_finds_overlapping_and_nested_phrases():
+    matcher = SkillMatcher([
+        ("Machine Learning", ["machine", "learning"]),
+        ("Deep Learning", ["deep", "learning"]),
+        ("Learning", ["learning"]),
+        ("Python", ["python"]),
+    ])
+    assert found(matcher, "deep learning and machine learning in python") == [
+        ("Deep Learning", 0, 2),
+        ("Learning", 1, 2),
+        ("Learning", 4, 5),
+        ("Machine Learning", 3, 5),
+        ("Python", 6, 7),
+    ]
+
+
+def test_follows_failure_links_across_partial_matches():
+    matcher = SkillMatcher([("abc", ["a", "b", "c"]), ("bcd", ["b", "c", "d"]), ("ab x", ["a", "b", "x"])])
+    assert found(matcher, "a b c d") == [("abc", 0, 3), ("bcd", 1, 4)]
+    assert found(matcher, "a a b x") == [("ab x", 1, 4)]
+
+
+def test_skips_empty_and_duplicate_phrases():
+    matcher = SkillMatcher([("SQL", ["sql"]), ("Sql", ["sql"]), ("Nothing", [])])
+    assert matcher.skills == ["SQL"]
+    assert found(matcher, "sql") == [("SQL", 0, 1)]
+
+
+def test_compiled_matcher_uses_pipeline_tokens(registry):
+    taxonomy = SkillTaxonomy(["Node.js", "C++", "Project Management"], name="test")
+    matcher = compile_skill_matcher(taxonomy, registry.get("tokenizer"))
+    tokens = [token.lower_ for token in registry.get("tokenizer")("Led project management for Node.js and C++ teams")]
+    assert sorted(matcher.skills[skill_id] for skill_id, _, _ in matcher.find(tokens)) == ["C++", "Node.js", "Project Management"]
+
+
+def test_matcher_cache_dir_comes_from_the_environment(registry, tmp_path, monkeypatch):
+    import skill_taxonomy
+
+    monkeypatch.setattr(skill_taxonomy, "MATCHER_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(skill_taxonomy, "_matchers", {})
+    taxonomy = SkillTaxonomy(["Python", "SQL"], name="cached")
+    matcher = skill_taxonomy.get_skill_matcher(taxonomy, registry.get("tokenizer"))
+    assert len(list(tmp_path.glob("skill_matcher-*.pkl"))) == 1
+
+    # A new process (simulated by clearing the in-memory cache) loads the pickled automaton
+    monkeypatch.setattr(skill_taxonomy, "_matchers", {})
+    monkeypatch.setattr(skill_taxonomy, "compile_skill_matcher", None)
+    loaded = skill_taxonomy.get_skill_matcher(taxonomy, registry.get("tokenizer"))
+    assert loaded is not matcher
+    assert loaded.skills == matcher.skills
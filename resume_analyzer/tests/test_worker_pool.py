@@ -0,0 +1,74 @@
+# test_worker_pool.py
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+import worker_pool
+from worker_pool import AnalysisWorkerPool
+
+
+def _load_nothing(api_key):
+    pass
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    # Forked workers skip model loading; _ping is all warm() runs
+    monkeypatch.setattr(worker_pool, "_init_worker", _load_nothing)
+    pool = AnalysisWorkerPool(api_key=None, max_workers=2, start_method="fork")
+    yield pool
+    pool.shutdown()
+
+
+def dying_pool():
+    # Every worker exits while starting up, like one killed while loading its models
+    return ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("fork"),
+                               initializer=os._exit, initargs=(1,))
+
+
+def test_warm_replaces_a_pool_whose_worker_died(pool):
+    broken = pool._executor = dying_pool()
+    pids = pool.warm()
+    assert pool._executor is not broken
+    assert len(pids) == 2
+
+
+def test_warm_gives_up_after_its_rounds(pool, monkeypatch):
+    monkeypatch.setattr(AnalysisWorkerPool, "executor", property(lambda self: self._executor or dying_pool()))
+    with pytest.raises(BrokenProcessPool):
+        pool.warm(rounds=2)
+
+
+def gone(path, timeout=5):
+    # Done-callbacks run just after result() wakes up
+    deadline = time.monotonic() + timeout
+    while path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return not path.exists()
+
+
+def test_upload_is_removed_when_its_job_is_lost_with_the_pool(pool, tmp_path):
+    upload = tmp_path / "upload.pdf"
+    upload.write_bytes(b"%PDF")
+    pool._executor = dying_pool()
+    job_id = pool.submit_analysis(str(upload), "Python developer", "Any tips?")
+    with pytest.raises(BrokenProcessPool):
+        pool.result(job_id, timeout=30)
+    assert gone(upload)
+
+
+def test_upload_is_removed_when_its_job_is_cancelled(pool, tmp_path):
+    upload = tmp_path / "upload.pdf"
+    upload.write_bytes(b"%PDF")
+    # Keep both workers busy so the analysis is still queued at shutdown
+    for _ in range(6):
+        pool.submit(time.sleep, 0.5)
+    job_id = pool.submit_analysis(str(upload), "Python developer", "Any tips?")
+    pool.shutdown()
+    assert pool.status(job_id)["error"] == "Cancelled"
+    assert gone(upload)
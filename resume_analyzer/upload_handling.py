@@ -0,0 +1,97 @@
+# upload_handling.py
+# Bounded-memory ingestion of uploaded resume files
+
+import hashlib
+import mmap
+import os
+import tempfile
+import weakref
+from file_handling import FileHandler
+
+MAX_UPLOAD_BYTES = int(os.environ.get("MAX_UPLOAD_BYTES", 10 * 1024 * 1024))
+CHUNK_SIZE = 64 * 1024
+ALLOWED_EXTENSIONS = (".pdf", ".docx")
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class UploadedResume:
+    """Streams an upload into a private temp file in fixed-size chunks.
+
+    The file is hashed on the way in and rejected as soon as it passes
+    max_bytes, so at most one chunk is held in memory. Only the extension of
+    the client-supplied filename is used. The temp file is removed on close(),
+    on leaving a with-block, or when the object is garbage collected.
+    """
+
+    def __init__(self, stream, filename, max_bytes=MAX_UPLOAD_BYTES, declared_size=None, chunk_size=CHUNK_SIZE):
+        self.stream = stream
+        self.filename = filename
+        self.extension = os.path.splitext(filename or "")[1].lower()
+        self.max_bytes = max_bytes
+        self.declared_size = declared_size
+        self.chunk_size = chunk_size
+        self.path = None
+        self.size = 0
+        self.sha256 = None
+        self._finalizer = None
+
+    def open(self):
+        if self.extension not in ALLOWED_EXTENSIONS:
+            raise ValueError(f"Unsupported file type: {self.extension}. Please provide a '.docx' or '.pdf' file.")
+        # Reject early when the client tells us the size up front
+        if self.declared_size is not None and self.declared_size > self.max_bytes:
+            raise UploadTooLarge(f"File is larger than the {self.max_bytes // (1024 * 1024)} MB limit.")
+
+        fd, self.path = tempfile.mkstemp(prefix="resume-", suffix=self.extension)
+        self._finalizer = weakref.finalize(self, _remove_quietly, self.path)
+
+        sha256 = hashlib.sha256()
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in iter(lambda: self.stream.read(self.chunk_size), b""):
+                    self.size += len(chunk)
+                    if self.size > self.max_bytes:
+                        raise UploadTooLarge(f"File is larger than the {self.max_bytes // (1024 * 1024)} MB limit.")
+                    sha256.update(chunk)
+                    f.write(chunk)
+        except BaseException:
+            self.close()
+            raise
+
+        self.sha256 = sha256.hexdigest()
+        # The extraction cache can use this hash instead of reading the file again
+        if FileHandler.cache is not None:
+            FileHandler.cache.remember(self.path, self.sha256)
+        return self
+
+    def buffer(self):
+        """Returns a read-only memory map of the upload (empty files cannot be mapped)."""
+        with open(self.path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def detach(self):
+        """Hands the temp file over to the caller, who becomes responsible for removing it."""
+        if self._finalizer is not None:
+            self._finalizer.detach()
+            self._finalizer = None
+        return self.path
+
+    def close(self):
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
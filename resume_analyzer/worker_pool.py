@@ -0,0 +1,299 @@
+# worker_pool.py
+# Pre-warmed analyzer processes behind a local job queue
+
+import os
+import logging
+import threading
+import time
+import uuid
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from instrumentation import REGISTRY, STAGE_SECONDS, timed
+from llm_gateway import LLM_DISABLED_MESSAGE
+
+WORKERS = int(os.environ.get("ANALYSIS_WORKERS", os.cpu_count() or 1))
+# Finished jobs kept for polling before the oldest are forgotten
+MAX_FINISHED_JOBS = int(os.environ.get("ANALYSIS_MAX_FINISHED_JOBS", 1000))
+LLM_TIMEOUT = float(os.environ.get("LLM_TIMEOUT", 30))
+# Workers are started fresh rather than forked from the threaded web process,
+# which may already hold an LLM client, a SQLite connection or locked mutexes
+START_METHOD = os.environ.get("WORKER_START_METHOD", "spawn")
+
+# Per-process analyzers, built once by the pool initializer
+_components = None
+
+logger = logging.getLogger("resume_analyzer.worker_pool")
+
+
+def collect_results(futures, timeout):
+    """Waits for each future until a shared deadline; failures become errors instead of failing the request."""
+    deadline = time.monotonic() + timeout
+    results, errors = {}, {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result(timeout=max(deadline - time.monotonic(), 0))
+        except TimeoutError:
+            # Only stops calls still queued; a running call ends at the client's own request timeout
+            future.cancel()
+            results[name] = None
+            errors[name] = f"Timed out after {timeout:g}s"
+        except Exception as e:
+            results[name] = None
+            errors[name] = str(e)
+    return results, errors
+
+
+def _init_worker(api_key):
+    global _components
+    # Workers forked (WORKER_START_METHOD=fork) inherit the parent's samples; only report what happens here
+    REGISTRY.drain()
+    from nlp_registry import get_registry
+    from ats_scoring import ATSScoring
+    from career_coaching import CareerCoach
+    from GenAI_module import ResumeAnalyzer
+    from file_handling import disable_parallel_pages
+
+    # Jobs already run one per worker; a page pool in each would oversubscribe the cores
+    disable_parallel_pages()
+
+    registry = get_registry()
+    # Load the pipelines now so the first job does not pay for it
+    registry.get("ner")("warm up")
+    registry.get("tokenizer")("warm up")
+    _components = {
+        "registry": registry,
+        "ats": ATSScoring(registry=registry),
+        "analyzer": ResumeAnalyzer(api_key=api_key, registry=registry),
+        # No key: the LLM-backed parts of each analysis are reported as disabled
+        "career_coach": CareerCoach(api_key=api_key) if api_key else None,
+        "llm_executor": ThreadPoolExecutor(max_workers=2, thread_name_prefix="llm"),
+    }
+
+
+def _run_job(fn, args, kwargs):
+    # Metrics recorded in the worker travel back with the result and are merged by the parent
+    try:
+        return fn(*args, **kwargs), REGISTRY.drain()
+    except BaseException as e:
+        # Failed jobs report theirs on the exception, which is pickled back with its attributes
+        e.metrics = REGISTRY.drain()
+        raise
+
+
+def _ping(hold=0):
+    # Holding the worker briefly makes the next ping land on a different process
+    time.sleep(hold)
+    return os.getpid()
+
+
+def analyze_resume(file_path, job_description, user_query, source=None, remove_file=True):
+    """Full analysis of one resume file, run inside a worker process.
+
+    Returns the same payload as the Flask form endpoint. The file is removed
+    afterwards unless remove_file is False.
+    """
+    from file_handling import FileHandler
+    from resume_document import ResumeDocument
+
+    try:
+        resume_text = FileHandler.extract_text(file_path)
+    finally:
+        if remove_file:
+            _remove_file(file_path)
+
+    ats, analyzer, career_coach = _components["ats"], _components["analyzer"], _components["career_coach"]
+    llm_executor = _components["llm_executor"]
+
+    # Gemini round-trips overlap the local scoring, as in the web process
+    llm_futures = {}
+    if career_coach is not None:
+        llm_futures = {
+            # Failures propagate so collect_results reports them in "errors"
+            "career_advice": llm_executor.submit(career_coach.get_career_advice, resume_text, user_query, raise_errors=True),
+            "insights": llm_executor.submit(analyzer.get_resume_insights, resume_text, raise_errors=True)
+        }
+    document = ResumeDocument.from_text(resume_text, registry=_components["registry"], source=source)
+    ats_result = ats.score_resume(document, job_description)
+    skill_scores = analyzer.extract_skills(document)
+
+    # Whatever Gemini time the local scoring did not hide
+    with timed("llm_collect"):
+        llm_results, errors = collect_results(llm_futures, LLM_TIMEOUT)
+    if career_coach is None:
+        llm_results = {"career_advice": None, "insights": None}
+        errors = {"career_advice": LLM_DISABLED_MESSAGE, "insights": LLM_DISABLED_MESSAGE}
+
+    return {
+        "ats_result": ats_result,
+        "career_advice": llm_results["career_advice"],
+        "skills": skill_scores,
+        "insights": llm_results["insights"],
+        "errors": errors
+    }
+
+
+def _remove_file(file_path):
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+
+def job_error(error):
+    """A message for a failed job that is safe to show to the client."""
+    if isinstance(error, BrokenProcessPool):
+        return "The analysis worker stopped unexpectedly (the file may be too large to process); please retry"
+    return str(error) or type(error).__name__
+
+
+class AnalysisWorkerPool:
+    """Runs analysis jobs on long-lived processes that keep spaCy models and analyzers loaded.
+
+    submit() queues a job and returns its ID; status() reports "queued",
+    "running", "done" or "failed" along with the result or error. Processes
+    are started by warm() (or on first use) and reused for every job.
+    """
+
+    def __init__(self, api_key, max_workers=WORKERS, max_finished_jobs=MAX_FINISHED_JOBS, start_method=START_METHOD):
+        self.api_key = api_key
+        self.max_workers = max_workers
+        self.max_finished_jobs = max_finished_jobs
+        self.start_method = start_method
+        self._executor = None
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_init_worker, initargs=(self.api_key,)
+                )
+            return self._executor
+
+    def warm(self, rounds=5):
+        """Starts the worker processes and waits until each has loaded its models; returns their PIDs."""
+        pids = set()
+        for attempt in range(rounds):
+            executor = self.executor
+            try:
+                futures = [executor.submit(_run_job, _ping, (0.2,), {}) for _ in range(self.max_workers)]
+                for future in futures:
+                    pid, drained = future.result()
+                    REGISTRY.merge(drained)
+                    pids.add(pid)
+            except BrokenProcessPool:
+                # A worker died while loading (e.g. out of memory); start again on a fresh pool
+                self._replace_broken(executor, rewarm=False)
+                if attempt == rounds - 1:
+                    raise
+                pids.clear()
+                continue
+            if len(pids) >= self.max_workers:
+                break
+        return sorted(pids)
+
+    def submit(self, fn, *args, **kwargs):
+        """Queues fn(*args, **kwargs) on a worker and returns the job ID."""
+        return self._submit(fn, args, kwargs)[0]
+
+    def _submit(self, fn, args, kwargs):
+        job_id = uuid.uuid4().hex
+        executor = self.executor
+        try:
+            future = executor.submit(_run_job, fn, args, kwargs)
+        except BrokenProcessPool:
+            # A worker died since the last job; start over with a fresh pool
+            self._replace_broken(executor)
+            executor = self.executor
+            future = executor.submit(_run_job, fn, args, kwargs)
+        with self._lock:
+            self._jobs[job_id] = {"future": future, "submitted_at": time.time(), "finished_at": None}
+        future.add_done_callback(lambda future, job_id=job_id: self._finished(job_id, future, executor))
+        return job_id, future
+
+    def _replace_broken(self, broken, rewarm=True):
+        """Drops a pool whose worker died (e.g. killed for running out of memory) and warms a new one."""
+        with self._lock:
+            if self._executor is not broken:
+                return  # Already replaced by another caller
+            self._executor = None
+        logger.warning("An analysis worker died; restarting the worker pool")
+        broken.shutdown(wait=False, cancel_futures=True)
+        if rewarm:
+            threading.Thread(target=self._rewarm, name="worker-pool-rewarm", daemon=True).start()
+
+    def _rewarm(self):
+        try:
+            self.warm()
+        except Exception:
+            logger.exception("Could not restart the analysis workers")
+
+    def submit_analysis(self, file_path, job_description, user_query, source=None):
+        """Queues analyze_resume for a file the worker takes ownership of (and removes).
+
+        The file is also removed if the job never runs, e.g. when it is cancelled
+        by shutdown() or lost with a worker that died.
+        """
+        try:
+            job_id, future = self._submit(analyze_resume, (file_path, job_description, user_query), {"source": source})
+        except BaseException:
+            _remove_file(file_path)
+            raise
+        future.add_done_callback(lambda future: _remove_file(file_path))
+        return job_id
+
+    def _finished(self, job_id, future, executor):
+        if not future.cancelled() and future.exception() is None:
+            REGISTRY.merge(future.result()[1])
+        elif not future.cancelled():
+            REGISTRY.merge(getattr(future.exception(), "metrics", None))
+            if isinstance(future.exception(), BrokenProcessPool):
+                self._replace_broken(executor)
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job["finished_at"] = time.time()
+                # Queueing plus processing, as seen by the caller
+                STAGE_SECONDS.observe(job["finished_at"] - job["submitted_at"], stage="job")
+            finished = [key for key, job in self._jobs.items() if job["finished_at"] is not None]
+            for key in finished[:max(len(finished) - self.max_finished_jobs, 0)]:
+                del self._jobs[key]
+
+    def status(self, job_id):
+        """Returns the job's state and, once finished, its result or error; None for unknown IDs."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return None
+
+        future = job["future"]
+        status = {"job_id": job_id, "submitted_at": job["submitted_at"], "finished_at": job["finished_at"]}
+        if not future.done():
+            status["status"] = "running" if future.running() else "queued"
+        elif future.cancelled():
+            status["status"] = "failed"
+            status["error"] = "Cancelled"
+        elif future.exception() is not None:
+            status["status"] = "failed"
+            status["error"] = job_error(future.exception())
+        else:
+            status["status"] = "done"
+            status["result"] = future.result()[0]
+        return status
+
+    def result(self, job_id, timeout=None):
+        """Blocks until the job finishes and returns its result (or raises its error)."""
+        with self._lock:
+            job = self._jobs[job_id]
+        return job["future"].result(timeout=timeout)[0]
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)